@@ -1,32 +1,18 @@
-import matplotlib.pyplot as plt
+from primality.report import Report
 
+plots = Report('error_luk')
 
-# Функция проверки простоты Лукаса-Лемера (используем оригинальную, неоптимизированную версию для честного тестирования)
-def is_prime_lucas(n):
-    if n < 2:
-        return False
-    if n == 2:
-        return True
-    if n % 2 == 0:
-        return False
 
-    def lucas_lehmer_test(p):
-        s = 4
-        M = 2 ** p - 1
-        for _ in range(p - 2):
-            s = (s * s - 2) % M
-        return s == 0
+# Функция проверки простоты Лукаса-Лемера (общий движок: приведение по модулю 2^p - 1 сдвигами, без деления)
+from primality.lucas_lehmer import is_prime_lucas
 
-    return lucas_lehmer_test(n.bit_length() - 1)
 
+# Числа Кармайкла до заданного предела берутся из каталога псевдопростых
+# (критерий Корсельта по решету; при первом запуске каталог строится и сохраняется на диск)
+from primality import pseudoprimes
 
-# Список чисел Кармайкла до определенного предела (используем заранее известный список чисел Кармайкла)
-carmichael_numbers = [
-    561, 1105, 1729, 2465, 2821, 6601, 8911, 10585, 15841, 29341, 41041, 46657,
-    52633, 62745, 63973, 75361, 101101, 115921, 126217, 162401, 172081, 188461,
-    252601, 278545, 294409, 314821, 334153, 340561, 399001, 410041, 449065,
-    488881, 512461
-]
+carmichael_limit = 10 ** 7
+carmichael_numbers = pseudoprimes.carmichael_numbers(carmichael_limit)
 
 
 # Функция для подсчета ошибок теста простоты Лукаса на числах Кармайкла
@@ -53,9 +39,13 @@ colors = ['lightgreen', 'lightcoral']
 explode = (0, 0.1)  # выделение сектора с ошибками
 
 # Строим круговую диаграмму
-plt.figure(figsize=(8, 8))
-plt.pie(sizes, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%',
-        shadow=True, startangle=140)
-plt.axis('equal')  # Сохраняем круглый вид диаграммы
-plt.title('Errors in Lucas Primality Test on Carmichael Numbers')
-plt.show()
\ No newline at end of file
+if plots.enabled:
+    plt = plots.pyplot()
+    plt.figure(figsize=(8, 8))
+    plt.pie(sizes, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%',
+            shadow=True, startangle=140)
+    plt.axis('equal')  # Сохраняем круглый вид диаграммы
+    plt.title('Errors in Lucas Primality Test on Carmichael Numbers')
+    plots.show('lucas_pie')
+
+plots.close()
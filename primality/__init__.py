@@ -0,0 +1,47 @@
+# Общая библиотека тестов простоты для экспериментальных скриптов.
+# Подмодули импортируются при первом обращении к имени (PEP 562): import primality ничего
+# не загружает, а NumPy и прочие зависимости подтягиваются только нужными модулями
+import importlib
+
+# Функция jacobi называется так же, как подмодуль: её нужно привязать до того, как какой-нибудь
+# подмодуль импортирует .jacobi и атрибут пакета станет модулем (jacobi.py без зависимостей)
+from .jacobi import jacobi, kronecker
+
+# Имя -> подмодуль, в котором оно определено
+_EXPORTS = {
+    'is_prime_bpsw': 'bpsw',
+    'factorize': 'factorization',
+    'prime_factors': 'factorization',
+    'double_check': 'lucas_lehmer',
+    'is_prime_lucas': 'lucas_lehmer',
+    'is_prime_fermat': 'fermat',
+    'is_prime_lucas_test': 'lucas_test',
+    'is_prime_miller_rabin': 'miller_rabin',
+    'PREFILTER': 'prefilter',
+    'Prefilter': 'prefilter',
+    'TESTS': 'registry',
+    'get_test': 'registry',
+    'get_tests': 'registry',
+    'register': 'registry',
+    'PrimeBitmap': 'sieve',
+    'SieveOracle': 'sieve',
+    'is_prime_sieve': 'sieve',
+    'iter_primes': 'sieve',
+    'sieve_of_eratosthenes': 'sieve',
+    'is_prime_solovay_strassen': 'solovay_strassen',
+}
+
+__all__ = sorted([*_EXPORTS, 'jacobi', 'kronecker'])
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
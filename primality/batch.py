@@ -0,0 +1,343 @@
+import time
+
+import numpy as np
+
+from .miller_rabin import WITNESSES
+
+U64 = np.uint64
+_LOW32 = U64(0xFFFFFFFF)
+_32 = U64(32)
+_ONE = U64(1)
+
+# Пакетные тесты работают с n < 2^63: так сумма в редукции Монтгомери не переполняет uint64
+BATCH_LIMIT = 1 << 63
+# Длина куска массива, обрабатываемого за раз (промежуточные массивы помещаются в кэш)
+CHUNK = 1 << 14
+# Ширина окна при возведении в степень (по WINDOW бит показателя за одно умножение)
+WINDOW = 4
+
+_LIMITS = np.array([limit for limit, _ in WITNESSES[:-1]], dtype=U64)
+_BASES = [bases for _, bases in WITNESSES]
+
+
+# Полное произведение 64 x 64 -> 128 бит через 32-битные половины: (старшие, младшие 64 бита)
+def _mul_wide(a, b):
+    a0, a1 = a & _LOW32, a >> _32
+    b0, b1 = b & _LOW32, b >> _32
+    p00, p01, p10, p11 = a0 * b0, a0 * b1, a1 * b0, a1 * b1
+    mid = (p00 >> _32) + (p01 & _LOW32) + (p10 & _LOW32)
+    return p11 + (p01 >> _32) + (p10 >> _32) + (mid >> _32), (mid << _32) | (p00 & _LOW32)
+
+
+# Общая часть контекстов: выборка подмножества элементов без повторного расчёта констант
+class _Context:
+    def take(self, index):
+        other = object.__new__(type(self))
+        other.__dict__.update({key: value[index] for key, value in self.__dict__.items()})
+        return other
+
+
+# Арифметика по модулю n < 2^32: произведение помещается в uint64, хватает обычного %
+class _PlainContext(_Context):
+    def __init__(self, n):
+        self.n = n
+        self.one = np.ones_like(n)
+        self.minus_one = n - _ONE
+
+    def enter(self, a):
+        return a % self.n
+
+    def mul(self, a, b):
+        return a * b % self.n
+
+
+# Арифметика Монтгомери по модулю нечётного n < 2^63 с R = 2^64; числа хранятся как x*R mod n
+class _MontgomeryContext(_Context):
+    def __init__(self, n):
+        inv = n.copy()
+        for _ in range(5):
+            inv *= U64(2) - n * inv  # метод Ньютона: верных бит 3 -> 6 -> ... -> 96
+        one = (U64(0xFFFFFFFFFFFFFFFF) % n + _ONE) % n  # R mod n
+        r2 = one.copy()
+        for _ in range(64):
+            r2 <<= _ONE
+            r2 = np.where(r2 >= n, r2 - n, r2)
+        self.n = n
+        self.ninv = U64(0) - inv  # -n^(-1) mod 2^64
+        self.r2 = r2  # R^2 mod n
+        self.one = one
+        self.minus_one = n - one
+
+    # Редукция Монтгомери: (hi*2^64 + lo) / R mod n. Младшие слова T и m*n в сумме дают 0 mod 2^64,
+    # поэтому из младшей половины в старшую переходит ровно (lo != 0)
+    def _redc(self, hi, lo):
+        m = lo * self.ninv
+        mh, _ = _mul_wide(m, self.n)
+        t = hi + mh + (lo != 0)
+        return np.where(t >= self.n, t - self.n, t)
+
+    def enter(self, a):
+        return self.mul(a % self.n, self.r2)
+
+    def mul(self, a, b):
+        return self._redc(*_mul_wide(a, b))
+
+
+# a^e по модулю ctx.n поэлементно (показатели у элементов разные); результат во внутренней форме ctx.
+# Окно в WINDOW бит: таблица степеней a^0..a^(2^WINDOW - 1), затем по WINDOW возведений в квадрат
+# и одно умножение на выбранную для каждого элемента степень
+def _powmod(ctx, a, e):
+    size = 1 << WINDOW
+    table = np.empty((size, len(e)), dtype=U64)
+    table[0] = ctx.one
+    table[1] = ctx.enter(a)
+    for i in range(2, size):
+        table[i] = ctx.mul(table[i - 1], table[1])
+    columns = np.arange(len(e))
+    digits = -(-int(e.max()).bit_length() // WINDOW)
+    result = ctx.one.copy()
+    for position in range(digits - 1, -1, -1):
+        if position != digits - 1:
+            for _ in range(WINDOW):
+                result = ctx.mul(result, result)
+        digit = (e >> U64(position * WINDOW)) & U64(size - 1)
+        result = ctx.mul(result, table[digit.astype(np.intp), columns])
+    return result
+
+
+# Символ Якоби (a/n) поэлементно для нечётных n, как jacobi: двойки снимаются разом
+# (младший бит a даёт их число), дальше обрабатываются только ещё не завершённые элементы
+def jacobi_batch(a, n):
+    a = a % n
+    n = n.copy()
+    result = np.ones(len(a), dtype=np.int8)
+    live = np.flatnonzero(a != 0)
+    while len(live):
+        x, m = a[live], n[live]
+        t = np.log2((x & (~x + _ONE)).astype(np.float64)).astype(U64)
+        x >>= t
+        m8 = m & U64(7)
+        flip = (t & _ONE == _ONE) & ((m8 == 3) | (m8 == 5))
+        flip ^= x & m & U64(3) == 3
+        result[live] = np.where(flip, -result[live], result[live])
+        a[live], n[live] = m % x, x
+        live = live[a[live] != 0]
+    return np.where(n == 1, result, 0).astype(np.int8)
+
+
+# Сильная проверка по основаниям a: True, где a — свидетель составности n
+def _strong_witness(ctx, n, a):
+    d = n - _ONE
+    r = np.zeros(len(n), dtype=np.int64)
+    while True:
+        even = d & _ONE == 0
+        if not even.any():
+            break
+        d = np.where(even, d >> _ONE, d)
+        r += even
+    x = _powmod(ctx, a, d)
+    passed = (x == ctx.one) | (x == ctx.minus_one)
+    for i in range(1, int(r.max())):
+        active = ~passed & (i < r)
+        if not active.any():
+            break
+        x = ctx.mul(x, x)
+        passed |= active & (x == ctx.minus_one)
+    return ~passed
+
+
+# Детерминированный Миллер-Рабин: для каждого n свой набор оснований (см. miller_rabin.WITNESSES).
+# После каждого основания дальше проверяются только ещё не отсеянные элементы
+def _miller_rabin_kernel(ctx, n, rng, k):
+    prime = np.ones(len(n), dtype=bool)
+    group = np.searchsorted(_LIMITS, n, side='right')
+    for g in np.unique(group).tolist():
+        members = np.flatnonzero(group == g)
+        for base in _BASES[g]:
+            live = members[prime[members]]
+            if not len(live):
+                break
+            a = U64(base) % n[live]
+            check = live[a != 0]  # основание кратно n — ничего не проверяет
+            if len(check):
+                prime[check] &= ~_strong_witness(ctx.take(check), n[check], U64(base) % n[check])
+    return prime
+
+
+# Тест Ферма: k случайных оснований из [2, n - 2]
+def _fermat_kernel(ctx, n, rng, k):
+    prime = np.ones(len(n), dtype=bool)
+    live = np.arange(len(n))
+    for _ in range(k):
+        if not len(live):
+            break
+        sub = ctx.take(live)
+        a = rng.integers(2, n[live] - _ONE, dtype=U64)
+        prime[live] = _powmod(sub, a, n[live] - _ONE) == sub.one
+        live = live[prime[live]]
+    return prime
+
+
+# Тест Соловея-Штрассена: k случайных оснований из [2, n - 1]
+def _solovay_strassen_kernel(ctx, n, rng, k):
+    prime = np.ones(len(n), dtype=bool)
+    live = np.arange(len(n))
+    for _ in range(k):
+        if not len(live):
+            break
+        sub, m = ctx.take(live), n[live]
+        a = rng.integers(2, m, dtype=U64)
+        j = jacobi_batch(a, m)
+        x = _powmod(sub, a, (m - _ONE) >> _ONE)
+        expected = np.where(j == 1, sub.one, sub.minus_one)
+        prime[live] = (j != 0) & (x == expected)
+        live = live[prime[live]]
+    return prime
+
+
+# Тест Ферма по фиксированному основанию (в k передаётся основание): a^(n-1) ≡ 1 (mod n)
+def _fermat_base_kernel(ctx, n, rng, base):
+    return _powmod(ctx, U64(base) % n, n - _ONE) == ctx.one
+
+
+# Сложение и вычитание по модулю n для вычетов из [0, n) (n < 2^63, переполнения нет)
+def _add(a, b, n):
+    s = a + b
+    return np.where(s >= n, s - n, s)
+
+
+def _sub(a, b, n):
+    return np.where(a >= b, a - b, a + (n - b))
+
+
+# Полные квадраты среди n: у них нет D с (D/n) = -1
+def _is_square(n):
+    r = np.sqrt(n.astype(np.float64)).astype(U64)
+    r = np.where(r * r > n, r - _ONE, r)
+    r = np.where((r + _ONE) * (r + _ONE) <= n, r + _ONE, r)
+    return r * r == n
+
+
+# Параметр D Селфриджа для каждого n (первое из 5, -7, 9, -11, ... с (D/n) = -1) и маска n,
+# у которых по дороге нашёлся общий делитель с D. Полные квадраты нужно исключить заранее
+def selfridge_batch(n):
+    D = np.zeros(len(n), dtype=np.int64)
+    divisible = np.zeros(len(n), dtype=bool)
+    todo = np.arange(len(n))
+    d = 5
+    while len(todo):
+        m = n[todo]
+        a = U64(d) % m if d > 0 else (m - U64(-d) % m) % m
+        j = jacobi_batch(a, m)
+        found = j == -1
+        zero = (j == 0) & (m != U64(abs(d)))
+        D[todo[found]] = d
+        divisible[todo[zero]] = True
+        todo = todo[~found & ~zero]
+        d = -d - 2 if d > 0 else -d + 2
+    return D, divisible
+
+
+# Тест Лукаса с параметрами Селфриджа P = 1, Q = (1 - D)/4: U_(n+1) ≡ 0 (mod n).
+# Лестница та же, что в lucas_sequence: пара (U_j, U_(j+1)) без делений
+def _lucas_kernel(ctx, n, rng, k):
+    prime = ~_is_square(n)
+    index = np.flatnonzero(prime)
+    D, divisible = selfridge_batch(n[index])
+    prime[index[divisible]] = False
+    index, D = index[~divisible], D[~divisible]
+    ctx, n = ctx.take(index), n[index]
+    Q = (1 - D) // 4
+    q = np.abs(Q).astype(U64) % n
+    Q = ctx.enter(np.where(Q < 0, (n - q) % n, q))
+    e = n + _ONE
+    U, U1 = np.zeros_like(n), ctx.one
+    for bit in range(int(e.max()).bit_length() - 1, -1, -1):
+        U2 = ctx.mul(U, _sub(_add(U1, U1, n), U, n))
+        U21 = _sub(ctx.mul(U1, U1), ctx.mul(Q, ctx.mul(U, U)), n)
+        odd = (e >> U64(bit)) & _ONE == _ONE
+        U, U1 = np.where(odd, U21, U2), np.where(odd, _sub(U21, ctx.mul(Q, U2), n), U21)
+    prime[index] = U == 0
+    return prime
+
+
+# Общий каркас пакетного теста: мелкие и чётные n (или всё, что решил prefilter) решаются сразу,
+# остальные — кусками по CHUNK, n < 2^32 обычным %, большие — в форме Монтгомери
+def _run_batch(values, kernel, k, seed, prefilter):
+    n = np.asarray(values, dtype=U64)
+    shape = n.shape
+    n = n.ravel()
+    if len(n) and int(n.max()) >= BATCH_LIMIT:
+        raise ValueError('пакетные тесты поддерживают только n < 2^63')
+    rng = np.random.default_rng(seed)
+    if prefilter is None:
+        result = (n == 2) | (n == 3)
+        todo = np.flatnonzero((n >= 5) & (n & _ONE == _ONE))
+    else:
+        result, decided = prefilter.check_array(n)
+        todo = np.flatnonzero(~decided)
+    for start in range(0, len(todo), CHUNK):
+        index = todo[start:start + CHUNK]
+        small = n[index] < U64(1 << 32)
+        for mask, context in ((small, _PlainContext), (~small, _MontgomeryContext)):
+            sub = index[mask]
+            if len(sub):
+                result[sub] = kernel(context(n[sub]), n[sub], rng, k)
+    return result.reshape(shape)
+
+
+# Пакетные версии тестов: массив целых n < 2^63 -> булева маска «вероятно простое»
+def is_prime_miller_rabin_batch(values, prefilter=None):
+    return _run_batch(values, _miller_rabin_kernel, 0, None, prefilter)
+
+
+def is_prime_fermat_batch(values, k=5, seed=None, prefilter=None):
+    return _run_batch(values, _fermat_kernel, k, seed, prefilter)
+
+
+def is_prime_solovay_strassen_batch(values, k=5, seed=None, prefilter=None):
+    return _run_batch(values, _solovay_strassen_kernel, k, seed, prefilter)
+
+
+# Вероятно простые по фиксированному основанию base (без случайности) и по тесту Лукаса.
+# Составные числа, прошедшие эти тесты, — псевдопростые Ферма и Лукаса (см. pseudoprimes)
+def is_fermat_probable_prime_batch(values, base=2):
+    return _run_batch(values, _fermat_base_kernel, base, None, None)
+
+
+def is_lucas_probable_prime_batch(values):
+    return _run_batch(values, _lucas_kernel, 0, None, None)
+
+
+BATCH_TESTS = {
+    'Miller-Rabin': is_prime_miller_rabin_batch,
+    'Fermat': is_prime_fermat_batch,
+    'Solovay-Strassen': is_prime_solovay_strassen_batch,
+}
+
+
+def is_prime_batch(values, test='Miller-Rabin', **options):
+    return BATCH_TESTS[test](values, **options)
+
+
+# Пропускная способность (чисел в секунду) поэлементного цикла и пакетной версии на count
+# случайных нечётных числах до 2^bits: {тест: (поэлементно, пакетно)}
+def benchmark(count=10 ** 5, bits=62, seed=1):
+    from .fermat import is_prime_fermat
+    from .miller_rabin import is_prime_miller_rabin
+    from .solovay_strassen import is_prime_solovay_strassen
+
+    scalar = {'Miller-Rabin': is_prime_miller_rabin, 'Fermat': is_prime_fermat,
+              'Solovay-Strassen': is_prime_solovay_strassen}
+    rng = np.random.default_rng(seed)
+    values = rng.integers(1 << (bits - 1), 1 << bits, size=count, dtype=U64) | _ONE
+    numbers = values.tolist()
+    result = {}
+    for name, batch in BATCH_TESTS.items():
+        started = time.perf_counter()
+        for x in numbers:
+            scalar[name](x)
+        middle = time.perf_counter()
+        batch(values)
+        result[name] = (count / (middle - started), count / (time.perf_counter() - middle))
+    return result
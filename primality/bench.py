@@ -0,0 +1,193 @@
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Разогрев перед замерами (нс): кэши, ленивые таблицы и т. п. успевают заполниться
+WARMUP_NS = 50_000_000
+# Минимальная длительность одного замера: число вызовов в замере подбирается так, чтобы его
+# превысить (как timeit.autorange), иначе шум таймера сопоставим с самим временем
+MIN_SAMPLE_NS = 2_000_000
+# Число замеров и бюджет времени на все замеры одной функции
+REPEAT = 15
+MIN_REPEAT = 5
+MAX_TIME_NS = 2_000_000_000
+# Выбросы — за пределами [Q1 - k*IQR, Q3 + k*IQR] (границы Тьюки)
+OUTLIER_IQR = 1.5
+# Квантили распределения Стьюдента для 95 % доверительного интервала, df = 1..30
+_T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def _t95(df):
+    return _T95[df - 1] if df <= len(_T95) else 1.96
+
+
+# Время number вызовов func(*args) в наносекундах
+def _run(func, args, number):
+    started = time.perf_counter_ns()
+    for _ in range(number):
+        func(*args)
+    return time.perf_counter_ns() - started
+
+
+# Разогрев и подбор числа вызовов в одном замере: 1, 2, 5, 10, 20, 50, ...
+def calibrate(func, *args, warmup_ns=WARMUP_NS, min_sample_ns=MIN_SAMPLE_NS):
+    deadline = time.perf_counter_ns() + warmup_ns
+    while True:
+        _run(func, args, 1)
+        if time.perf_counter_ns() >= deadline:
+            break
+    number = 1
+    while True:
+        for step in (1, 2, 5):
+            if _run(func, args, number * step) >= min_sample_ns:
+                return number * step
+        number *= 10
+
+
+# Отбрасывание выбросов по границам Тьюки: (оставшиеся, число отброшенных)
+def reject_outliers(samples, k=OUTLIER_IQR):
+    if len(samples) < 4:
+        return list(samples), 0
+    q1, _, q3 = statistics.quantiles(samples, n=4)
+    low, high = q1 - k * (q3 - q1), q3 + k * (q3 - q1)
+    kept = [x for x in samples if low <= x <= high]
+    return kept, len(samples) - len(kept)
+
+
+# Сводка по замерам (нс на вызов): среднее, медиана, минимум, отклонение и 95 % интервал для среднего
+def summarize(samples):
+    kept, rejected = reject_outliers(samples)
+    mean = statistics.fmean(kept)
+    stdev = statistics.stdev(kept) if len(kept) > 1 else 0.0
+    half = _t95(len(kept) - 1) * stdev / math.sqrt(len(kept)) if len(kept) > 1 else 0.0
+    return {'mean_ns': mean, 'median_ns': statistics.median(kept), 'min_ns': min(kept), 'stdev_ns': stdev,
+            'ci_low_ns': mean - half, 'ci_high_ns': mean + half, 'samples': len(kept), 'rejected': rejected}
+
+
+# Время одного вызова func(*args): разогрев, подбор числа вызовов в замере, repeat замеров
+# (не меньше MIN_REPEAT, остальные — пока укладываются в max_time_ns), выбросы отбрасываются.
+# Сборщик мусора на время замеров выключен, как в timeit
+def measure(func, *args, repeat=REPEAT, max_time_ns=MAX_TIME_NS, warmup_ns=WARMUP_NS,
+            min_sample_ns=MIN_SAMPLE_NS):
+    number = calibrate(func, *args, warmup_ns=warmup_ns, min_sample_ns=min_sample_ns)
+    samples = []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        deadline = time.perf_counter_ns() + max_time_ns
+        while len(samples) < repeat and (len(samples) < MIN_REPEAT or time.perf_counter_ns() < deadline):
+            samples.append(_run(func, args, number) / number)
+    finally:
+        if enabled:
+            gc.enable()
+    return dict(summarize(samples), number=number)
+
+
+# Среднее время func(n) по набору входов: замеряется проход по всем inputs, результат делится на их число
+def measure_each(func, inputs, **options):
+    inputs = list(inputs)
+
+    def run_all():
+        for n in inputs:
+            func(n)
+
+    stats = measure(run_all, **options)
+    for key in ('mean_ns', 'median_ns', 'min_ns', 'stdev_ns', 'ci_low_ns', 'ci_high_ns'):
+        stats[key] /= len(inputs)
+    stats['inputs'] = len(inputs)
+    return stats
+
+
+# Отдельный проход для памяти (tracemalloc замедляет каждое выделение, поэтому не совмещается
+# с замером времени): пик и остаток выделенной памяти за один вызов, в байтах
+def measure_memory(func, *args):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'peak_bytes': peak, 'net_bytes': current}
+
+
+# Память func(n) для каждого входа, как measure_memory, но за одну трассировку: сборка мусора
+# и tracemalloc.start — один раз на набор, перед каждым вызовом пик сбрасывается (reset_peak),
+# и пик с остатком считаются от памяти, занятой до вызова
+def measure_memory_each(func, inputs):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        results = []
+        for n in inputs:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            func(n)
+            current, peak = tracemalloc.get_traced_memory()
+            results.append({'peak_bytes': peak - before, 'net_bytes': current - before})
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+# Набор замеров: tests — {имя: функция}, cases — {метка: список входов}.
+# Возвращает {имя: {метка: сводка}}; при memory=True у каждой сводки есть пик памяти на весь набор входов
+def run_suite(tests, cases, memory=True, **options):
+    results = {}
+    for name, func in tests.items():
+        results[name] = {}
+        for label, inputs in cases.items():
+            stats = measure_each(func, inputs, **options)
+            if memory:
+                stats.update(measure_memory(lambda: [func(n) for n in inputs]))
+            results[name][label] = stats
+    return results
+
+
+# Коммит, в котором лежит пакет (None вне git)
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Сведения о запуске, по которым сравнимы результаты разных коммитов
+def environment():
+    return {'commit': _git_commit(), 'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(), 'machine': platform.machine(),
+            'platform': platform.platform(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+
+
+# Результаты в JSON вместе со сведениями о запуске
+def save_json(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': results}, f, ensure_ascii=False, indent=2)
+
+
+def load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Сравнение двух файлов save_json с результатами run_suite: {имя: {метка: (отношение средних
+# new/old, различие значимо — доверительные интервалы не пересекаются)}}
+def compare(old_path, new_path):
+    old, new = load_json(old_path)['results'], load_json(new_path)['results']
+    report = {}
+    for name in old.keys() & new.keys():
+        for label in old[name].keys() & new[name].keys():
+            a, b = old[name][label], new[name][label]
+            significant = b['ci_high_ns'] < a['ci_low_ns'] or b['ci_low_ns'] > a['ci_high_ns']
+            report.setdefault(name, {})[label] = (b['mean_ns'] / a['mean_ns'], significant)
+    return report
@@ -0,0 +1,28 @@
+import math
+
+from .lucas_sequence import is_strong_lucas_probable_prime, selfridge_parameters
+from .miller_rabin import is_strong_probable_prime
+from .prefilter import Prefilter
+
+# Собственный фильтр BPSW: тест вызывается изнутри пакета (factorization, counterexamples, scaling),
+# и его пробные деления не должны попадать в счётчики общего prefilter.PREFILTER
+_PREFILTER = Prefilter()
+
+
+# Тест Бейли-Померанца-Селфриджа-Вагстаффа: малые делители (по умолчанию простые до 1000, см. prefilter),
+# сильный тест по основанию 2 и сильный тест Лукаса с параметрами Селфриджа.
+# Контрпримеры неизвестны; для n < 2^64 ответ точный
+def is_prime_bpsw(n, prefilter=_PREFILTER):
+    verdict = prefilter(n)
+    if verdict is not None:
+        return verdict
+    if not is_strong_probable_prime(n, 2):
+        return False
+    # У полного квадрата подходящего D не существует
+    if math.isqrt(n) ** 2 == n:
+        return False
+    params = selfridge_parameters(n)
+    if params is None:
+        return False
+    _, P, Q = params
+    return is_strong_lucas_probable_prime(n, P, Q)
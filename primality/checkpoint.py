@@ -0,0 +1,65 @@
+import os
+import struct
+import zlib
+
+# Формат файла: заголовок (сигнатура, версия, p, номер итерации, длина остатка),
+# остаток s в little-endian и CRC32 всего предыдущего содержимого
+MAGIC = b'LLCK'
+VERSION = 1
+_HEADER = struct.Struct('<4sBQQI')
+_CRC = struct.Struct('<I')
+
+
+def _backup_path(path):
+    return path + '.prev'
+
+
+# Атомарная запись контрольной точки: сначала во временный файл, затем замена.
+# Предыдущая точка сохраняется рядом, чтобы было к чему вернуться, если последняя испорчена
+def save_checkpoint(path, p, iteration, s):
+    body = s.to_bytes((p + 7) // 8, 'little')
+    data = _HEADER.pack(MAGIC, VERSION, p, iteration, len(body)) + body
+    data += _CRC.pack(zlib.crc32(data))
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    if os.path.exists(path):
+        os.replace(path, _backup_path(path))
+    os.replace(tmp, path)
+
+
+def _read_checkpoint(path, p):
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size + _CRC.size:
+        return None
+    (crc,) = _CRC.unpack_from(data, len(data) - _CRC.size)
+    if zlib.crc32(data[:-_CRC.size]) != crc:
+        return None
+    magic, version, saved_p, iteration, size = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or saved_p != p:
+        return None
+    if _HEADER.size + size + _CRC.size != len(data):
+        return None
+    s = int.from_bytes(data[_HEADER.size:_HEADER.size + size], 'little')
+    return iteration, s
+
+
+# Последняя целая контрольная точка для показателя p: (номер итерации, s) или None
+def load_checkpoint(path, p):
+    for candidate in (path, _backup_path(path)):
+        state = _read_checkpoint(candidate, p)
+        if state is not None:
+            return state
+    return None
+
+
+def remove_checkpoint(path):
+    for candidate in (path, _backup_path(path), path + '.tmp'):
+        if os.path.exists(candidate):
+            os.remove(candidate)
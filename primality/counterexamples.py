@@ -0,0 +1,170 @@
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from .bpsw import is_prime_bpsw
+from .fermat import is_prime_fermat
+from .lucas_lehmer import is_prime_lucas
+
+# Сколько чисел проверяет один процесс за задание
+CHUNK_SIZE = 10 ** 5
+# Начальное значение генератора, как random.seed(45) в Baillie-PSW.py
+SEED = 45
+
+
+# Комбинированный тест Лукаса и Ферма (из Baillie-PSW.py)
+def is_prime_combined(n):
+    # Если n mod 5 равно 2 или 3, применяем оба теста
+    if n % 5 in (2, 3):
+        return is_prime_lucas(n) and is_prime_fermat(n)
+    # Если n mod 5 равно 1 или 4, применяем один из тестов
+    elif n % 5 in (1, 4):
+        return is_prime_lucas(n) or is_prime_fermat(n)
+    # В остальных случаях число не проходит тест
+    else:
+        return False
+
+
+# Последовательный поиск контрпримеров на [start, stop) — прежний цикл find_counterexamples
+def search_range(start, stop):
+    counterexamples = []
+    for n in range(start, stop):
+        # Ищем контрпримеры для n mod 5 = 1 или 4
+        if (n % 5 == 1 or n % 5 == 4) and is_prime_combined(n) and not is_prime_lucas(n) and not is_prime_fermat(n):
+            counterexamples.append(n)
+    return counterexamples
+
+
+# Тесты-компоненты комбинированного теста: в конвейере каждый вызывается ровно один раз на n
+COMPONENTS = {'lucas': is_prime_lucas, 'fermat': is_prime_fermat}
+
+
+# Комбинированный тест по уже вычисленным вердиктам v = {компонента: ответ}
+def combined(n, v):
+    if n % 5 in (2, 3):
+        return v['lucas'] and v['fermat']
+    elif n % 5 in (1, 4):
+        return v['lucas'] or v['fermat']
+    else:
+        return False
+
+
+# Прежнее условие find_counterexamples. На согласованных вердиктах оно всегда ложно:
+# в старом цикле его выполняли только числа, на которых повторные раунды Ферма давали разные ответы
+def _counterexample(n, v):
+    return combined(n, v) and not v['lucas'] and not v['fermat']
+
+
+# Составное число, прошедшее комбинированный тест. BPSW — эталон (для n < 2^64 ответ точный),
+# он запускается только для прошедших комбинированный тест
+def _composite(n, v):
+    return combined(n, v) and not is_prime_bpsw(n)
+
+
+# Предикаты, выводимые из вердиктов компонент: имя -> функция (n, v)
+PREDICATES = {'counterexample': _counterexample, 'composite': _composite}
+# Остатки n mod 5, на которых предикат проверяется: контрпримеры, как в прежнем цикле, ищутся
+# при n mod 5 = 1 или 4, а комбинированный тест проходят и числа с остатками 2 и 3
+RESIDUES = {'counterexample': (1, 4), 'composite': (1, 2, 3, 4)}
+
+
+# Конвейер на [start, stop): вердикты компонент считаются один раз на n, если хоть один
+# из предикатов проверяется на его остатке, и предикаты проверяются по ним. Возвращает {предикат: список n}
+def evaluate_range(start, stop, predicates=tuple(PREDICATES)):
+    found = {name: [] for name in predicates}
+    by_residue = [[name for name in predicates if r in RESIDUES[name]] for r in range(5)]
+    for n in range(start, stop):
+        names = by_residue[n % 5]
+        if not names:
+            continue
+        v = {name: test(n) for name, test in COMPONENTS.items()}
+        for name in names:
+            if PREDICATES[name](n, v):
+                found[name].append(n)
+    return found
+
+
+# Генератор каждого куска засевается парой (seed, начало куска): результат не зависит
+# ни от числа процессов, ни от порядка выполнения кусков (но зависит от chunk_size)
+def _run_chunk(args):
+    start, stop, seed, predicates = args
+    random.seed(f'{seed}:{start}')
+    if predicates is None:
+        return start, stop, search_range(start, stop)
+    return start, stop, evaluate_range(start, stop, predicates)
+
+
+# Параллельный поиск на [range_start, range_end) кусками по chunk_size. Отдаёт (начало, конец, результат)
+# по мере готовности кусков; результат — список контрпримеров прежнего цикла или, если заданы
+# predicates, словарь {предикат: список n} конвейера evaluate_range
+def search(range_start, range_end, workers=None, chunk_size=CHUNK_SIZE, seed=SEED, predicates=None):
+    tasks = [(start, min(start + chunk_size, range_end), seed, predicates)
+             for start in range(range_start, range_end, chunk_size)]
+    if workers == 1:
+        yield from map(_run_chunk, tasks)
+        return
+    with Pool(workers or os.cpu_count()) as pool:
+        yield from pool.imap_unordered(_run_chunk, tasks)
+
+
+# Все контрпримеры по возрастанию. Если задан output, найденные числа дописываются
+# в файл (по одному в строке) сразу после завершения своего куска
+def find_counterexamples(range_start, range_end, workers=None, chunk_size=CHUNK_SIZE, seed=SEED,
+                         output=None):
+    found = []
+    stream = open(output, 'w') if output else None
+    try:
+        for _, _, chunk in search(range_start, range_end, workers, chunk_size, seed):
+            found.extend(chunk)
+            if stream and chunk:
+                stream.writelines(f'{n}\n' for n in chunk)
+                stream.flush()
+    finally:
+        if stream:
+            stream.close()
+    return sorted(found)
+
+
+# То же для конвейера: {предикат: отсортированный список n}; в output строки «предикат n»
+def find_predicates(range_start, range_end, workers=None, chunk_size=CHUNK_SIZE, seed=SEED,
+                    output=None, predicates=tuple(PREDICATES)):
+    found = {name: [] for name in predicates}
+    stream = open(output, 'w') if output else None
+    try:
+        for _, _, chunk in search(range_start, range_end, workers, chunk_size, seed, tuple(predicates)):
+            for name, numbers in chunk.items():
+                found[name].extend(numbers)
+                if stream:
+                    stream.writelines(f'{name} {n}\n' for n in numbers)
+            if stream:
+                stream.flush()
+    finally:
+        if stream:
+            stream.close()
+    return {name: sorted(numbers) for name, numbers in found.items()}
+
+
+# Выигрыш конвейера: прежний цикл и evaluate_range на одном диапазоне в одном процессе,
+# генератор засевается одинаково. Возвращает {'legacy': с, 'cached': с, 'saved': с, 'saved_share': доля}
+def time_saved(range_start, range_end, seed=SEED):
+    random.seed(seed)
+    started = time.perf_counter()
+    search_range(range_start, range_end)
+    middle = time.perf_counter()
+    random.seed(seed)
+    evaluate_range(range_start, range_end, ('counterexample',))
+    legacy, cached = middle - started, time.perf_counter() - middle
+    return {'legacy': legacy, 'cached': cached, 'saved': legacy - cached, 'saved_share': 1 - cached / legacy}
+
+
+if __name__ == '__main__':
+    # python -m primality.counterexamples START STOP [WORKERS] [OUTPUT]
+    start, stop = int(sys.argv[1]), int(sys.argv[2])
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    output = sys.argv[4] if len(sys.argv) > 4 else None
+    begin = time.perf_counter()
+    counterexamples = find_counterexamples(start, stop, workers, output=output)
+    print(f'Counterexamples found: {counterexamples}')
+    print(f'Общее время: {time.perf_counter() - begin:.2f} с')
@@ -0,0 +1,82 @@
+import math
+import random
+from functools import lru_cache
+
+from .bpsw import is_prime_bpsw
+from .sieve import sieve_of_eratosthenes
+
+# Граница пробного деления: меньшие простые снимаются таблицей, большие ищет ро-метод
+TRIAL_LIMIT = 1 << 12
+SMALL_PRIMES = sieve_of_eratosthenes(TRIAL_LIMIT)
+# Сколько произведений |x - y| накапливается перед одним вычислением gcd в ро-методе Брента
+BATCH = 128
+
+
+# Нетривиальный делитель составного n ро-методом Полларда в варианте Брента.
+# Генератор случайных чисел локальный и зависит только от n: разложение воспроизводимо
+# и не сдвигает глобальную последовательность random, которой пользуются вероятностные тесты
+def pollard_brent(n):
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(n)
+    while True:
+        y, c = rng.randrange(1, n), rng.randrange(1, n)
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(BATCH, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += BATCH
+            r *= 2
+        if g == n:
+            # Накопленное произведение проскочило делитель — повторяем последний блок по шагу
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def _split(n, factors):
+    if n == 1:
+        return
+    if is_prime_bpsw(n):
+        factors[n] = factors.get(n, 0) + 1
+        return
+    d = pollard_brent(n)
+    _split(d, factors)
+    _split(n // d, factors)
+
+
+# Разложение n > 0 в виде кортежа пар (простое, степень) по возрастанию; результаты кэшируются
+@lru_cache(maxsize=4096)
+def _factor_pairs(n):
+    factors = {}
+    for p in SMALL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    _split(n, factors)
+    return tuple(sorted(factors.items()))
+
+
+# Каноническое разложение n: словарь {простое: степень}
+def factorize(n):
+    if n < 1:
+        raise ValueError('n должно быть положительным')
+    return dict(_factor_pairs(n))
+
+
+# Различные простые делители n по возрастанию
+def prime_factors(n):
+    return tuple(p for p, _ in _factor_pairs(n))
@@ -0,0 +1,21 @@
+import random
+
+from .screen import prefiltered
+
+
+# 1.5. Тест малой теоремы Ферма
+# Статистический тест на простоту, использующий малую теорему Ферма.
+@prefiltered
+def is_prime_fermat(n, k=5):
+    if n <= 1:
+        return False  # Числа меньше или равные 1 не являются простыми
+    if n <= 3:
+        return True  # 2 и 3 - простые числа
+    if n % 2 == 0:
+        return False  # Четные числа, кроме 2, не являются простыми
+
+    for _ in range(k):
+        a = random.randint(2, n - 2)
+        if pow(a, n - 1, n) != 1:
+            return False  # Составное число
+    return True  # Число прошло все раунды тестирования
@@ -0,0 +1,108 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy FFT-ветка недоступна
+    np = None
+
+# Ошибка округления результата свёртки, после которой точности float64 не хватило
+MAX_ROUND_ERROR = 0.4
+# Разрядность коэффициентов свёртки (2*b + log2 N), при которой float64 ещё с запасом точен
+PRECISION_BITS = 44
+# Проходов распространения переносов после каждого возведения в квадрат
+CARRY_PASSES = 3
+
+
+# Наименьшая длина преобразования N (вида 2^a * 3^b * 5^c — такие длины NumPy считает быстро),
+# при которой цифры по ceil(p/N) бит укладываются в точность float64
+def transform_length(p):
+    best = None
+    for a in range(p.bit_length() + 1):
+        for b in range(12):
+            for c in range(8):
+                N = 2 ** a * 3 ** b * 5 ** c
+                if N > p or (best is not None and N >= best):
+                    break
+                if 2 * -(-p // N) + math.log2(N) <= PRECISION_BITS:
+                    best = N
+    return best or 1
+
+
+# Возведение в квадрат по модулю 2^p - 1 через взвешенное преобразование с иррациональным
+# основанием (IBDWT, Крэндалл-Фаген). Число хранится N цифрами переменной длины:
+# цифра j занимает биты [ceil(p*j/N), ceil(p*(j+1)/N)). После умножения цифр на веса
+# 2^(ceil(p*j/N) - p*j/N) циклическая свёртка длины N сразу даёт квадрат по модулю 2^p - 1,
+# поэтому ни дополнения нулями, ни отдельного приведения не нужно
+class MersenneFFT:
+    def __init__(self, p):
+        if np is None:
+            raise ImportError('для FFT-возведения в квадрат нужен NumPy')
+        N = transform_length(p)
+        j = np.arange(N + 1, dtype=np.int64)
+        bounds = -(-p * j // N)
+        self.p = p
+        self.N = N
+        self.M = (1 << p) - 1
+        self.bounds = bounds
+        self.offsets = bounds[:-1]
+        self.widths = np.diff(bounds)
+        # Показатель веса считается как целое/N: так он точен и для N, не являющихся степенью 2
+        self.weights = np.exp2((self.offsets * N - p * j[:-1]) / N)
+        self.inverse = 1 / self.weights
+        self.max_error = 0.0  # наибольшая ошибка округления за всё время работы
+        # Для каждого бита числа: номер цифры и позиция бита внутри неё
+        self._bit_digit = np.repeat(np.arange(N), self.widths)
+        self._bit_shift = np.arange(p) - self.offsets[self._bit_digit]
+
+    def to_digits(self, s):
+        bits = np.unpackbits(np.frombuffer(s.to_bytes((self.p + 7) // 8, 'little'), dtype=np.uint8),
+                             bitorder='little')[:self.p]
+        return np.bincount(self._bit_digit, weights=bits * np.exp2(self._bit_shift), minlength=self.N)
+
+    def from_digits(self, digits):
+        # Цифры после переносов почти нормализованы: выделяем части в [0, 2^width),
+        # упаковываем их биты целиком, а редкие оставшиеся переносы добавляем по одному
+        carry = digits >> self.widths
+        digits = digits - (carry << self.widths)
+        bits = (digits[self._bit_digit] >> self._bit_shift) & 1
+        s = int.from_bytes(np.packbits(bits.astype(np.uint8), bitorder='little').tobytes(), 'little')
+        for j in np.flatnonzero(carry).tolist():
+            s += int(carry[j]) << int(self.bounds[j + 1])
+        return s % self.M
+
+    # count шагов s -> s*s - 2 со сдвигом остатка shift (см. lucas_lehmer._iterate)
+    def iterate(self, s, count, shift=0):
+        p, N = self.p, self.N
+        x = self.to_digits(s)
+        digits = x.astype(np.int64)
+        for _ in range(count):
+            shift = 2 * shift % p
+            z = np.fft.irfft(np.square(np.fft.rfft(x * self.weights)), n=N) * self.inverse
+            rounded = np.rint(z)
+            error = float(np.max(np.abs(z - rounded)))
+            self.max_error = max(self.max_error, error)
+            if error > MAX_ROUND_ERROR:
+                raise ArithmeticError(f'M{p}: ошибка округления FFT {error:.3f}, не хватает точности')
+            digits = rounded.astype(np.int64)
+            # Вычитаем 2 * 2^shift: бит k лежит в цифре j с началом offsets[j] <= k
+            k = (shift + 1) % p
+            j = int(np.searchsorted(self.offsets, k, side='right')) - 1
+            digits[j] -= 1 << (k - int(self.offsets[j]))
+            # Переносы: перенос из старшей цифры уходит в младшую, так как 2^p ≡ 1.
+            # Нескольких проходов хватает, чтобы цифры снова стали порядка 2^width
+            for _ in range(CARRY_PASSES):
+                carry = digits >> self.widths
+                digits -= carry << self.widths
+                digits += np.roll(carry, 1)
+            x = digits.astype(np.float64)
+        return self.from_digits(digits)
+
+
+_cache = {}
+
+
+def iterate_fft(s, p, count, shift=0):
+    engine = _cache.get(p)
+    if engine is None:
+        engine = _cache[p] = MersenneFFT(p)
+    return engine.iterate(s, count, shift)
@@ -0,0 +1,75 @@
+import random
+import sys
+import time
+
+
+# Символ Якоби (a/n) для нечётного n > 0, итеративно (без рекурсии).
+# Множители 2 снимаются разом: t нулей меняют знак, только если t нечётно и n ≡ 3, 5 (mod 8)
+def jacobi(a, n):
+    if n <= 0 or n % 2 == 0:
+        raise ValueError('n должно быть нечётным положительным')
+    a %= n
+    result = 1
+    while a:
+        t = (a & -a).bit_length() - 1
+        a >>= t
+        if t & 1 and n & 7 in (3, 5):
+            result = -result
+        # Квадратичный закон взаимности: знак меняется, если оба числа ≡ 3 (mod 4)
+        if a & n & 3 == 3:
+            result = -result
+        a, n = n % a, a
+    return result if n == 1 else 0
+
+
+# Символ Кронекера (a/n) для любого целого n: обобщение символа Якоби на чётные и отрицательные n
+def kronecker(a, n):
+    if n == 0:
+        return 1 if a in (1, -1) else 0
+    result = 1
+    if n < 0:
+        n = -n
+        if a < 0:
+            result = -result
+    t = (n & -n).bit_length() - 1
+    if t:
+        if a % 2 == 0:
+            return 0
+        n >>= t
+        if t & 1 and a & 7 in (3, 5):
+            result = -result
+    return result * jacobi(a, n)
+
+
+# Прежняя рекурсивная версия из is_prime_solovay_strassen — для сравнения в benchmark
+def _jacobi_recursive(a, n):
+    if a == 0:
+        return 0
+    if a == 1:
+        return 1
+    if a % 2 == 0:
+        if n % 8 == 1 or n % 8 == 7:
+            return _jacobi_recursive(a // 2, n)
+        elif n % 8 == 3 or n % 8 == 5:
+            return -_jacobi_recursive(a // 2, n)
+    if a % 4 == 3 and n % 4 == 3:
+        return -_jacobi_recursive(n % a, a)
+    else:
+        return _jacobi_recursive(n % a, a)
+
+
+# Среднее время одного символа для рекурсивной и итеративной версий на случайных bits-битных числах
+def benchmark(bits=2048, count=200):
+    pairs = [(random.getrandbits(bits), random.getrandbits(bits) | 1) for _ in range(count)]
+    result = {}
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 8 * bits))  # рекурсия снимает по одной двойке за вызов
+    try:
+        for name, symbol in (('recursive', _jacobi_recursive), ('iterative', jacobi)):
+            started = time.perf_counter()
+            for a, n in pairs:
+                symbol(a % n, n)
+            result[name] = (time.perf_counter() - started) / count
+    finally:
+        sys.setrecursionlimit(limit)
+    return result
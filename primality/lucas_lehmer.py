@@ -0,0 +1,262 @@
+import math
+import random
+import time
+
+from . import fft
+from .checkpoint import load_checkpoint, remove_checkpoint, save_checkpoint
+from .jacobi import jacobi
+
+try:
+    import gmpy2
+except ImportError:  # gmpy2 необязателен: без него работает ветка на встроенных int
+    gmpy2 = None
+
+
+# Приведение x >= 0 по модулю M = 2^p - 1 без деления.
+# Так как 2^p ≡ 1 (mod M), старшие биты складываются с младшими: x = (x & M) + (x >> p).
+# Для x < M^2 после одной свёртки x < 2M, поэтому достаточно одного вычитания
+def mersenne_mod(x, p, M):
+    x = (x & M) + (x >> p)
+    if x >= M:
+        x -= M
+    return x
+
+
+# Умножение x на 2^k по модулю 2^p - 1 — циклический сдвиг p-битового числа
+def rotate(x, k, p):
+    k %= p
+    return ((x << k) & ((1 << p) - 1)) | (x >> (p - k))
+
+
+# count шагов s -> s*s - 2 (mod M). Остаток может храниться со сдвигом: r = s * 2^shift.
+# Тогда r*r = s*s * 2^(2*shift), сдвиг удваивается, а вычитать нужно 2 * 2^shift
+def _iterate(s, p, count, shift, M):
+    if not shift:
+        for _ in range(count):
+            s = mersenne_mod(s * s, p, M) - 2
+            if s < 0:
+                s += M
+        return s
+    for _ in range(count):
+        shift = 2 * shift % p
+        s = mersenne_mod(s * s, p, M) - (1 << (shift + 1) % p)
+        if s < 0:
+            s += M
+    return s
+
+
+# Встроенные int
+def _iterate_python(s, p, count, shift=0):
+    return _iterate(s, p, count, shift, (1 << p) - 1)
+
+
+# mpz из gmpy2 (умножение GMP заметно быстрее встроенного на больших p)
+def _iterate_gmpy2(s, p, count, shift=0):
+    return int(_iterate(gmpy2.mpz(s), p, count, shift, gmpy2.mpz((1 << p) - 1)))
+
+
+# Реализации цикла Лукаса-Лемера: имя -> функция iterate(s, p, count, shift=0)
+BACKENDS = {'python': _iterate_python}
+if gmpy2 is not None:
+    BACKENDS['gmpy2'] = _iterate_gmpy2
+if fft.np is not None:
+    BACKENDS['fft'] = fft.iterate_fft
+
+# С какого p FFT-возведение в квадрат обгоняет встроенные int (по crossover: на разных машинах
+# переход лежит между 20000 и 86243, порог взят с запасом). GMP по замерам быстрее FFT на всех
+# проверенных p вплоть до 2976221, поэтому без калибровки FFT вместо gmpy2 не выбирается
+FFT_THRESHOLD = {'python': 40000}
+# Результаты последней калибровки: отсортированный список (p, самая быстрая реализация)
+_calibration = []
+
+
+# Самая быстрая из доступных реализаций без учёта FFT
+def default_backend():
+    return 'gmpy2' if 'gmpy2' in BACKENDS else 'python'
+
+
+# Реализация для показателя p: по таблице calibrate(), если она построена, иначе по порогам
+def choose_backend(p):
+    if _calibration:
+        best = _calibration[0][1]
+        for q, name in _calibration:
+            if q > p:
+                break
+            best = name
+        return best
+    name = default_backend()
+    if 'fft' in BACKENDS and name in FFT_THRESHOLD and p >= FFT_THRESHOLD[name]:
+        return 'fft'
+    return name
+
+
+# Сверка реализации с эталонным циклом на встроенных int: count шагов от случайных остатков
+def validate_backend(name, exponents=(89, 521, 4423, 21701, 86243), count=20, shift=True):
+    iterate = BACKENDS[name]
+    for p in exponents:
+        M = (1 << p) - 1
+        s = random.randrange(M)
+        k = random.randrange(p) if shift else 0
+        if iterate(s, p, count, k) != _iterate_python(s, p, count, k):
+            return False
+    return True
+
+
+# Время одного шага s -> s*s - 2 для каждой реализации и каждого p: {p: {имя: секунды}}
+def crossover(exponents=(4423, 21701, 86243, 216091, 756839), count=None):
+    table = {}
+    for p in exponents:
+        s = random.randrange((1 << p) - 1)
+        steps = count or max(3, 2000000 // p)
+        table[p] = {}
+        for name, iterate in BACKENDS.items():
+            iterate(s, p, 1)  # прогрев: кэши и планы FFT
+            started = time.perf_counter()
+            iterate(s, p, steps)
+            table[p][name] = (time.perf_counter() - started) / steps
+    return table
+
+
+# Замер crossover и запоминание самой быстрой реализации для каждого p (используется choose_backend)
+def calibrate(exponents=(4423, 21701, 86243, 216091, 756839), count=None):
+    table = crossover(exponents, count)
+    _calibration[:] = sorted((p, min(times, key=times.get)) for p, times in table.items())
+    return table
+
+
+# Интервал между контрольными точками по умолчанию, с
+CHECKPOINT_INTERVAL = 60.0
+# Доля времени счёта, которую разрешено тратить на проверку Якоби
+CHECK_OVERHEAD = 0.02
+# Блок итераций растёт, пока не займёт столько секунд (гранулярность точек и проверок)
+BLOCK_TIME = 0.5
+# Сколько раз подряд можно откатываться к проверенному состоянию
+MAX_ERRORS = 3
+
+
+def _is_prime_exponent(p):
+    if p < 2:
+        return False
+    if p % 2 == 0:
+        return p == 2
+    return all(p % q for q in range(3, math.isqrt(p) + 1, 2))
+
+
+# Проверка Якоби: для остатков s_k при k >= 1 символ ((s_k - 2) / M) равен -1
+# (или 0, если M составное и делится с s_k - 2). Сбой в арифметике даёт +1 с вероятностью 1/2
+def _jacobi_ok(s, M):
+    symbol = gmpy2.jacobi(s - 2, M) if gmpy2 is not None else jacobi(s - 2, M)
+    return symbol != 1
+
+
+# Цикл Лукаса-Лемера блоками с контрольными точками, проверкой Якоби и сдвигом остатка.
+# Контрольная точка (primality.checkpoint) пишется не чаще раза в interval секунд;
+# если запись оказалась дорогой, интервал растягивается так, чтобы она занимала не больше 1%.
+# Проверка Якоби запускается, пока её суммарное время не превышает check_overhead от счёта
+# (плюс обязательная проверка последнего остатка);
+# при сбое счёт откатывается к последнему проверенному состоянию
+def _run(iterate, p, shift, path, interval, check, check_overhead, stats):
+    M = (1 << p) - 1
+    state = load_checkpoint(path, p) if path else None
+    resumed_from, s = state if state is not None else (0, 4)
+    iteration, total = resumed_from, p - 2
+    shift = shift % p * pow(2, iteration, p) % p
+    r = rotate(s, shift, p)  # в точке хранится s без сдвига
+    good = (iteration, r, shift)
+    block = 1
+    checkpoints = checks = errors = failures = 0
+    compute_time = checkpoint_time = check_time = check_cost = 0.0
+    begin = saved_at = time.perf_counter()
+    while iteration < total:
+        count = min(block, total - iteration)
+        started = time.perf_counter()
+        r = iterate(r, p, count, shift)
+        shift = shift * pow(2, count, p) % p
+        iteration += count
+        now = time.perf_counter()
+        compute_time += now - started
+        if now - started < BLOCK_TIME:
+            block *= 2
+        if not check:
+            good = (iteration, r, shift)
+        elif check_time + check_cost <= check_overhead * compute_time or iteration == total:
+            ok = _jacobi_ok(rotate(r, p - shift, p), M)
+            checks += 1
+            check_cost = time.perf_counter() - now
+            check_time += check_cost
+            now = time.perf_counter()
+            if not ok:
+                errors += 1
+                failures += 1  # сбоев подряд с последней пройденной проверки
+                if failures > MAX_ERRORS:
+                    raise RuntimeError(f'M{p}: остаток не прошёл проверку Якоби на итерации {iteration} '
+                                       f'(сбоев подряд: {failures})')
+                iteration, r, shift = good
+                continue
+            good = (iteration, r, shift)
+            failures = 0
+        if path and now - saved_at >= interval and good[0] < total:
+            save_checkpoint(path, p, good[0], rotate(good[1], p - good[2], p))
+            saved_at = time.perf_counter()
+            checkpoints += 1
+            checkpoint_time += saved_at - now
+            interval = max(interval, 100 * (saved_at - now))
+    s = rotate(r, p - shift, p)
+    if path:
+        remove_checkpoint(path)
+    if stats is not None:
+        elapsed = time.perf_counter() - begin
+        stats.update(resumed_from=resumed_from, iterations=iteration - resumed_from,
+                     checkpoints=checkpoints, checkpoint_time=checkpoint_time,
+                     checks=checks, check_time=check_time, errors=errors,
+                     check_overhead=check_time / compute_time if compute_time else 0.0,
+                     res64=s & 0xFFFFFFFFFFFFFFFF, time=elapsed)
+    return s
+
+
+# Тест Лукаса-Лемера: True <=> M = 2^p - 1 простое.
+# checkpoint — путь к файлу контрольных точек: прерванный запуск продолжается с последней целой;
+# jacobi_check — периодическая проверка Якоби остатка; shift — начальный сдвиг остатка
+# (разные сдвиги дают независимую арифметику для двойной проверки);
+# stats (словарь) получает статистику запуска, включая res64 и накладные расходы проверок
+def lucas_lehmer(p, backend=None, checkpoint=None, checkpoint_interval=CHECKPOINT_INTERVAL,
+                 stats=None, jacobi_check=False, check_overhead=CHECK_OVERHEAD, shift=0):
+    if p == 2:
+        return True  # M = 3
+    # При составном p число 2^p - 1 составное, цикл можно не запускать
+    if not _is_prime_exponent(p):
+        return False
+    iterate = BACKENDS[backend or choose_backend(p)]
+    if checkpoint is None and stats is None and not jacobi_check and not shift:
+        return iterate(4, p, p - 2) == 0
+    s = _run(iterate, p, shift, checkpoint, checkpoint_interval, jacobi_check, check_overhead, stats)
+    return s == 0
+
+
+# Двойная проверка: второй проход идёт со случайным сдвигом остатка, поэтому вся его
+# арифметика выполняется над другими числами. Совпадение res64 подтверждает результат.
+# Возвращает (простое ли 2^p - 1, совпали ли проходы)
+def double_check(p, backend=None, shift=None, jacobi_check=True, stats=None):
+    if p == 2 or not _is_prime_exponent(p):
+        return lucas_lehmer(p), True
+    if shift is None:
+        shift = random.randrange(1, p)
+    first, second = {}, {}
+    result = lucas_lehmer(p, backend, stats=first, jacobi_check=jacobi_check)
+    lucas_lehmer(p, backend, stats=second, jacobi_check=jacobi_check, shift=shift)
+    match = first['res64'] == second['res64']
+    if stats is not None:
+        stats.update(first=first, second=second, shift=shift, match=match)
+    return result, match
+
+
+# 1.1. Тест простоты Лукаса
+# Тест Лукаса-Лемера для показателя p = n.bit_length() - 1, как в исходных скриптах
+def is_prime_lucas(n, backend=None):
+    if n < 2:
+        return False
+    if n == 2:
+        return True
+    if n % 2 == 0:
+        return False
+    return lucas_lehmer(n.bit_length() - 1, backend)
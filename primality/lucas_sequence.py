@@ -0,0 +1,122 @@
+import math
+import time
+
+from .jacobi import jacobi
+
+
+# Последовательности Лукаса U_k, V_k с параметрами P, Q и Q^k — всё по модулю n, за O(log k) шагов.
+# Лестница хранит пару (U_j, U_(j+1)) и не делит, поэтому годится для любого n (в том числе чётного):
+#   U_2j = U_j * (2*U_(j+1) - P*U_j),   U_(2j+1) = U_(j+1)^2 - Q*U_j^2,
+#   U_(j+2) = P*U_(j+1) - Q*U_j,        V_j = 2*U_(j+1) - P*U_j
+def lucas_sequence(P, Q, k, n):
+    U, U1, Qk = 0, 1 % n, 1 % n
+    for bit in bin(k)[2:]:
+        U, U1 = U * (2 * U1 - P * U) % n, (U1 * U1 - Q * U * U) % n
+        Qk = Qk * Qk % n
+        if bit == '1':
+            U, U1 = U1, (P * U1 - Q * U) % n
+            Qk = Qk * Q % n
+    return U, (2 * U1 - P * U) % n, Qk
+
+
+# Параметры Селфриджа: первое D из 5, -7, 9, -11, ... с символом Якоби (D/n) = -1.
+# Возвращает (D, P, Q) с P = 1, Q = (1 - D) / 4, или None, если найден делитель n
+def selfridge_parameters(n):
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            return D, 1, (1 - D) // 4
+        if j == 0 and abs(D) != n:
+            return None
+        D = -D - 2 if D > 0 else -D + 2
+
+
+# n + 1 = 2^s * d с нечётным d
+def _split(n):
+    m = n + 1
+    s = (m & -m).bit_length() - 1
+    return s, m >> s
+
+
+# Сильный тест Лукаса на вероятную простоту ((D/n) = -1, D = P^2 - 4Q):
+# n проходит, если U_d ≡ 0 или V_(d*2^r) ≡ 0 для некоторого 0 <= r < s
+def is_strong_lucas_probable_prime(n, P, Q):
+    s, d = _split(n)
+    U, V, Qk = lucas_sequence(P, Q, d, n)
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V, Qk = (V * V - 2 * Qk) % n, Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+# Сверхсильный тест Лукаса (Q = 1, P — первое из 3, 4, 5, ... с ((P^2 - 4)/n) = -1):
+# n проходит, если U_d ≡ 0 и V_d ≡ ±2, или V_(d*2^r) ≡ 0 для некоторого 0 <= r < s - 1
+def is_extra_strong_lucas_probable_prime(n):
+    if n == 2:
+        return True
+    if n < 2 or n % 2 == 0 or math.isqrt(n) ** 2 == n:
+        return False
+    P = 3
+    while True:
+        j = jacobi(P * P - 4, n)
+        if j == -1:
+            break
+        if j == 0 and P * P - 4 != n:
+            return n == P + 2 or n == P - 2
+        P += 1
+    s, d = _split(n)
+    U, V, _ = lucas_sequence(P, 1, d, n)
+    if U == 0 and V in (2, n - 2):
+        return True
+    for _ in range(s - 1):
+        if V == 0:
+            return True
+        V = (V * V - 2) % n
+    return False
+
+
+# Тест Фробениуса относительно x^2 - Px + Q при (D/n) = -1 (Крэндалл-Померанс, теорема 3.6.3):
+# gcd(n, 2QD) = 1, U_(n+1) ≡ 0 и V_(n+1) ≡ 2Q (mod n). По умолчанию — параметры Селфриджа
+def is_frobenius_probable_prime(n, P=None, Q=None):
+    if n == 2:
+        return True
+    if n < 2 or n % 2 == 0 or math.isqrt(n) ** 2 == n:
+        return False
+    if P is None:
+        params = selfridge_parameters(n)
+        if params is None:
+            return False
+        D, P, Q = params
+    else:
+        D = P * P - 4 * Q
+    if math.gcd(n, 2 * Q * D) != 1:
+        return False
+    U, V, _ = lucas_sequence(P, Q, n + 1, n)
+    return U == 0 and V == 2 * Q % n
+
+
+# Прежний линейный цикл из Baillie-PSW.py: n - 1 шагов u, v = v, u + v дают F_n = U_n(1, -1) mod n
+def _fibonacci_linear(n):
+    u, v = 1, 1
+    for _ in range(1, n):
+        u, v = v, (u + v) % n
+    return u
+
+
+# Сравнение линейного цикла и лестницы на числах Фибоначчи F_n mod n: {n: (линейно, лестница)} в секундах
+def benchmark(values=(10 ** 3 + 9, 10 ** 5 + 3, 10 ** 6 + 3, 10 ** 7 + 19)):
+    result = {}
+    for n in values:
+        started = time.perf_counter()
+        linear = _fibonacci_linear(n)
+        middle = time.perf_counter()
+        ladder = lucas_sequence(1, -1, n, n)[0]
+        finished = time.perf_counter()
+        if linear != ladder:
+            raise AssertionError(f'F_{n} mod {n}: {linear} != {ladder}')
+        result[n] = (middle - started, finished - middle)
+    return result
@@ -0,0 +1,38 @@
+import random
+
+from .factorization import prime_factors
+from .screen import prefiltered
+
+
+# 1.1. Тест простоты Лукаса
+# n простое, если найдётся a с a^(n-1) ≡ 1 и a^((n-1)/q) ≢ 1 (mod n) для каждого простого q | n-1.
+# Простые делители n - 1 находятся один раз на n (и кэшируются) и переиспользуются всеми основаниями
+@prefiltered
+def is_prime_lucas_test(n, k=5):
+    if n <= 1:
+        return False
+    if n == 2:
+        return True
+    if n % 2 == 0:
+        return False
+
+    factors = None
+    # Основной цикл теста
+    for _ in range(k):
+        # Выбираем случайное число в диапазоне от 2 до n-1
+        a = random.randint(2, n - 1)
+        # Проверяем условие pow(a, n-1, n) != 1
+        if pow(a, n - 1, n) != 1:
+            return False
+
+        # Раскладываем n - 1 только после первого пройденного условия Ферма
+        if factors is None:
+            factors = prime_factors(n - 1)
+        for q in factors:
+            # Проверяем условие pow(a, (n - 1) // q, n) == 1
+            if pow(a, (n - 1) // q, n) == 1:
+                break
+        else:
+            return True
+
+    return False
@@ -0,0 +1,115 @@
+import random
+
+from .screen import prefiltered
+
+# Наборы оснований, при которых тест Миллера-Рабина детерминирован:
+# для всех n < граница достаточно проверить указанные основания (Jaeschke, Sinclair)
+WITNESSES = [
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (9080191, (31, 73)),
+    (4759123141, (2, 7, 61)),
+    (1122004669633, (2, 13, 23, 1662803)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (1 << 64, (2, 325, 9375, 28178, 450775, 9780504, 1795265022)),
+]
+# Выше этой границы основания выбираются случайно
+DETERMINISTIC_LIMIT = WITNESSES[-1][0]
+
+
+# Минимальный детерминированный набор оснований для n или None, если n >= 2^64
+def witnesses(n):
+    for limit, bases in WITNESSES:
+        if n < limit:
+            return bases
+    return None
+
+
+# Разложение n - 1 = 2^r * d с нечётным d (младшие нули снимаются за один сдвиг)
+def decompose(n):
+    m = n - 1
+    r = (m & -m).bit_length() - 1
+    return r, m >> r
+
+
+# Сильная проверка по основанию a: True, если a — свидетель составности n.
+# Одно возведение в степень a^d, затем цепочка возведений в квадрат с ранним выходом:
+# встретив n - 1, число проходит проверку; встретив 1 (без n - 1 перед ней) — составное
+def trial_composite(a, n, r, d):
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return False
+    for _ in range(r - 1):
+        x = x * x % n
+        if x == n - 1:
+            return False
+        if x == 1:
+            return True  # дальше будут только единицы
+    return True
+
+
+# Сильное вероятно простое по основанию a (нечётное n > 2)
+def is_strong_probable_prime(n, a):
+    r, d = decompose(n)
+    a %= n
+    return a == 0 or not trial_composite(a, n, r, d)
+
+
+# 1.2. Тест Миллера-Рабина
+# При deterministic=True для n < 2^64 проверяются фиксированные основания (ответ точный
+# и воспроизводимый), для больших n — k случайных оснований, как раньше
+@prefiltered
+def is_prime_miller_rabin(n, k=5, deterministic=True):
+    if n <= 1:
+        return False  # Числа меньше или равные 1 не являются простыми
+    if n <= 3:
+        return True  # 2 и 3 - простые числа
+    if n % 2 == 0:
+        return False  # Четные числа, кроме 2, не являются простыми
+
+    r, d = decompose(n)  # n - 1 = 2^r * d
+    bases = witnesses(n) if deterministic else None
+    if bases is None:
+        bases = [random.randrange(2, n) for _ in range(k)]
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue  # основание кратно n — ничего не проверяет
+        if trial_composite(a, n, r, d):
+            return False  # Составное число
+    return True  # Число прошло все раунды тестирования
+
+
+# Прежний вариант проверки: отдельное возведение в степень a^(2^i * d) для каждого i
+def _trial_composite_naive(a, n, r, d):
+    if pow(a, d, n) == 1:
+        return False
+    for i in range(r):
+        if pow(a, 2 ** i * d, n) == n - 1:
+            return False
+    return True
+
+
+# Микробенчмарк: простые вида n = c * 2^shift + 1 (у n - 1 множитель 2^shift, r >= shift) —
+# для них проверка каждого основания проходит цепочку почти целиком
+def benchmark(shift=40, count=20, bits=128, rounds=5):
+    import time
+    numbers = []
+    c = (1 << (bits - shift)) + 1
+    while len(numbers) < count:
+        n = c * (1 << shift) + 1
+        if is_prime_miller_rabin(n):
+            numbers.append(n)
+        c += 2
+    bases = [random.randrange(2, numbers[0]) for _ in range(rounds)]
+    result = {}
+    for name, check in (('naive', _trial_composite_naive), ('chain', trial_composite)):
+        started = time.perf_counter()
+        for n in numbers:
+            r, d = decompose(n)
+            for a in bases:
+                check(a % n, n, r, d)
+        result[name] = (time.perf_counter() - started) / (len(numbers) * rounds)
+    return result
+
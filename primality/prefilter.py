@@ -0,0 +1,124 @@
+import math
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy нужен только для проверки массивов (check_array)
+    np = None
+
+from .sieve import sieve_of_eratosthenes
+
+# Колесо по 2, 3, 5, 7: остаток n mod 210 сразу отсекает кратные этим простым
+WHEEL_PRIMES = (2, 3, 5, 7)
+WHEEL = 210
+# По умолчанию — все простые меньше 1000 (168 штук), как в пробном делении BPSW
+DEFAULT_COUNT = 168
+STAGES = ('small', 'wheel', 'gcd', 'proven', 'passed')
+
+
+# Первые count простых: решето с запасом по оценке p_k < k * (ln k + ln ln k) при k >= 6
+def first_primes(count):
+    bound = 15 if count < 6 else int(count * (math.log(count) + math.log(math.log(count)))) + 1
+    return sieve_of_eratosthenes(bound)[:count]
+
+
+# Предварительный фильтр перед вероятностными тестами: отсекает числа с малыми простыми делителями.
+# Этапы: small — n не больше наибольшего простого таблицы (ответ по таблице);
+# wheel — делится на 2, 3, 5 или 7 (таблица остатков по модулю 210);
+# gcd — gcd(n, произведение остальных простых) > 1; proven — делителей нет и n < p_max^2, значит простое;
+# passed — решение за основным тестом. Счётчики этапов копятся в stats
+class Prefilter:
+    def __init__(self, count=DEFAULT_COUNT):
+        if count < len(WHEEL_PRIMES):
+            raise ValueError(f'нужно хотя бы {len(WHEEL_PRIMES)} простых')
+        self.primes = first_primes(count)
+        self.largest = self.primes[-1]
+        self.limit = self.largest ** 2
+        self.primorial = math.prod(self.primes[len(WHEEL_PRIMES):])
+        self._prime_set = frozenset(self.primes)
+        self._wheel = bytes(int(math.gcd(r, WHEEL) == 1) for r in range(WHEEL))
+        # Для массивов: простые сверх колеса группами с произведением < 2^63 (gcd в uint64)
+        self.groups = []
+        for p in self.primes[len(WHEEL_PRIMES):]:
+            if self.groups and self.groups[-1] * p < 1 << 63:
+                self.groups[-1] *= p
+            else:
+                self.groups.append(p)
+        self.reset()
+
+    def reset(self):
+        self.stats = dict.fromkeys(('calls',) + STAGES, 0)
+
+    # Доля чисел, решённых на каждом этапе: {этап: доля}
+    def hit_rates(self):
+        calls = self.stats['calls']
+        return {stage: self.stats[stage] / calls if calls else 0.0 for stage in STAGES}
+
+    # True — простое, False — составное, None — фильтр ничего не решил
+    def __call__(self, n):
+        stats = self.stats
+        stats['calls'] += 1
+        if n <= self.largest:
+            stats['small'] += 1
+            return n in self._prime_set
+        if not self._wheel[n % WHEEL]:
+            stats['wheel'] += 1
+            return False
+        if math.gcd(n, self.primorial) != 1:
+            stats['gcd'] += 1
+            return False
+        if n < self.limit:
+            stats['proven'] += 1
+            return True
+        stats['passed'] += 1
+        return None
+
+    # Тот же фильтр для массива целых 0 <= n < 2^63: (ответ, решено) — две булевы маски
+    def check_array(self, values):
+        if np is None:
+            raise ImportError('для проверки массивов нужен NumPy')
+        n = np.asarray(values, dtype=np.uint64).ravel()
+        verdict = np.zeros(len(n), dtype=bool)
+        decided = n <= np.uint64(self.largest)
+        verdict[decided] = np.isin(n[decided], np.array(self.primes, dtype=np.uint64))
+        wheel = np.frombuffer(self._wheel, dtype=np.uint8)
+        rest = np.flatnonzero(~decided)
+        hit = wheel[n[rest] % np.uint64(WHEEL)] == 0
+        decided[rest[hit]] = True
+        rest = rest[~hit]
+        stats = self.stats
+        stats['calls'] += len(n)
+        stats['small'] += len(n) - len(rest) - int(hit.sum())
+        stats['wheel'] += int(hit.sum())
+        for group in self.groups:
+            m = n[rest]
+            G = np.uint64(group)
+            hit = np.gcd(m % G, G) != 1
+            decided[rest[hit]] = True
+            stats['gcd'] += int(hit.sum())
+            rest = rest[~hit]
+        proven = rest[n[rest] < np.uint64(min(self.limit, 1 << 63))]
+        verdict[proven] = decided[proven] = True
+        stats['proven'] += len(proven)
+        stats['passed'] += len(rest) - len(proven)
+        shape = np.shape(values)
+        return verdict.reshape(shape), decided.reshape(shape)
+
+
+# Общий экземпляр с настройками по умолчанию
+PREFILTER = Prefilter()
+
+
+# Время проверки count случайных нечётных bits-битных чисел тестом test без фильтра и с ним,
+# плюс доли этапов фильтра: (без фильтра, с фильтром, hit_rates)
+def benchmark(test, count=20000, bits=64, prime_count=DEFAULT_COUNT):
+    numbers = [random.getrandbits(bits) | 1 | 1 << (bits - 1) for _ in range(count)]
+    prefilter = Prefilter(prime_count)
+    started = time.perf_counter()
+    for n in numbers:
+        test(n)
+    middle = time.perf_counter()
+    for n in numbers:
+        test(n, prefilter=prefilter)
+    return middle - started, time.perf_counter() - middle, prefilter.hit_rates()
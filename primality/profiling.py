@@ -0,0 +1,116 @@
+import inspect
+import os
+import sys
+import tracemalloc
+from functools import partial
+
+from .bench import measure_each, measure_memory, measure_memory_each
+
+# Сколько мест выделения памяти показывать в отчёте
+TOP = 5
+# Снимок памяти берётся на новом максимуме, начиная с половины пика обычного прохода, и не чаще,
+# чем раз на рост на 1/GROWTH; когда снимок объясняет пик без 1/GROWTH, обработчик снимается
+GROWTH = 16
+
+
+# gmpy2 выделяет память мимо tracemalloc: тесты с параметром backend (Лукас-Лемер) в проходах
+# памяти считаются на встроенных int, остатки которых занимают столько же
+def _traceable(func):
+    try:
+        parameters = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return func
+    return partial(func, backend='python') if 'backend' in parameters else func
+
+
+# Строки, выделения в которых не относятся к вызову: весь tracemalloc и этот модуль (обработчик,
+# снимки), а также строки def функций на стеке — их объекты кадров создаёт sys.setprofile,
+# в обычном вызове их нет. Сравниваются пути, без fnmatch из tracemalloc.Filter, который сам
+# компилирует шаблоны во время прохода
+def _own(stat, stack):
+    frame = stat.traceback[0]
+    return frame.filename in (tracemalloc.__file__, __file__) or (frame.filename, frame.lineno) in stack
+
+
+def _stack(frame):
+    lines = set()
+    while frame is not None:
+        lines.add((frame.f_code.co_filename, frame.f_code.co_firstlineno))
+        frame = frame.f_back
+    return lines
+
+
+def _location(frame):
+    return f'{os.path.basename(frame.filename)}:{frame.lineno}'
+
+
+# Места выделения, которые держали больше всего памяти в самый тяжёлый момент вызова func(*args):
+# [('sieve.py:40', байт), ...]. peak — пик того же вызова из bench.measure_memory. Трассировка
+# в один кадр; на вызовах и возвратах функций (sys.setprofile) сравнивается прирост занятой памяти
+# с момента входа в func, снимки tracemalloc берутся лишь у пика (в отчёт идёт тот, где выделений
+# самого вызова больше всего), память снимков из прироста вычитается. Имена мест собираются после
+# прохода: os.path внутри обработчика сам выделял бы память
+def _top_allocations(func, args, peak, top):
+    state = {'next': peak // 2, 'base': None, 'size': 0, 'top': []}
+    previous = sys.getprofile()
+
+    def hook(frame, event, arg):
+        if state['base'] is None:
+            state['base'] = tracemalloc.get_traced_memory()[0]
+            return
+        current = tracemalloc.get_traced_memory()[0] - state['base']
+        if current < state['next']:
+            return
+        stack = _stack(frame)
+        stats = [stat for stat in tracemalloc.take_snapshot().statistics('lineno') if not _own(stat, stack)]
+        size = sum(stat.size for stat in stats)
+        if size > state['size']:
+            state['size'], state['top'] = size, [(stat.traceback[0], stat.size) for stat in stats[:top]]
+        state['next'] = current + max(current // GROWTH, 1)
+        del stack, stats
+        state['base'] = tracemalloc.get_traced_memory()[0] - current
+        if state['size'] >= peak - peak // GROWTH:
+            sys.setprofile(previous)
+
+    if not peak:
+        return []
+    tracemalloc.start(1)
+    try:
+        sys.setprofile(hook)
+        try:
+            func(*args)
+        finally:
+            sys.setprofile(previous)
+    finally:
+        tracemalloc.stop()
+    return [(_location(frame), size) for frame, size in state['top']]
+
+
+# Память одного вызова func(*args), отдельно от замера времени: peak_bytes и net_bytes — из
+# обычного прохода bench.measure_memory (без профилировщика), top — из второго прохода с
+# привязкой к местам выделения (_top_allocations)
+def profile_memory(func, *args, top=TOP):
+    func = _traceable(func)
+    memory = measure_memory(func, *args)
+    return dict(memory, top=_top_allocations(func, args, memory['peak_bytes'], top))
+
+
+# Время и память для func на наборе входов — независимыми проходами: время через bench.measure_each
+# (без трассировки), пик памяти каждого вызова через bench.measure_memory_each, места выделения —
+# только для вызова с наибольшим пиком
+def profile_case(func, inputs, top=TOP, **options):
+    inputs = list(inputs)
+    stats = measure_each(func, inputs, **options)
+    traced = _traceable(func)
+    memory = measure_memory_each(traced, inputs)
+    heaviest = max(range(len(inputs)), key=lambda i: memory[i]['peak_bytes'])
+    peak = memory[heaviest]['peak_bytes']
+    stats.update(mean_peak_bytes=sum(m['peak_bytes'] for m in memory) / len(memory), max_peak_bytes=peak,
+                 top=_top_allocations(traced, (inputs[heaviest],), peak, top))
+    return stats
+
+
+# Профиль набора тестов: tests — {имя: функция}, cases — {метка: входы} -> {имя: {метка: сводка}}
+def profile_suite(tests, cases, top=TOP, **options):
+    return {name: {label: profile_case(func, inputs, top, **options) for label, inputs in cases.items()}
+            for name, func in tests.items()}
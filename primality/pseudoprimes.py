@@ -0,0 +1,218 @@
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy каталог можно только читать
+    np = None
+
+from .jacobi import jacobi
+from .miller_rabin import is_strong_probable_prime
+from .sieve import sieve_of_eratosthenes
+
+# Виды псевдопростых. Для fermat, strong и euler строится отдельный раздел на каждое основание
+KINDS = ('carmichael', 'fermat', 'strong', 'euler', 'lucas')
+# Нечётных чисел в одном куске решета
+CHUNK_SIZE = 1 << 20
+
+# Формат каталога: заголовок (сигнатура, версия, границы [start, limit), число разделов),
+# оглавление (имя раздела, смещение, длина, CRC32 данных) и сами разделы — отсортированные
+# массивы uint64 в little-endian с выравниванием на 8 байт (их можно отображать в память)
+MAGIC = b'PSPC'
+VERSION = 1
+_HEADER = struct.Struct('<4sBxxxQQI4x')
+_ENTRY = struct.Struct('<32sQQI4x')
+
+
+# Имена разделов каталога для заданных видов и оснований: carmichael, lucas, fermat:2, strong:3, ...
+def section_names(kinds=KINDS, bases=(2,)):
+    names = []
+    for kind in kinds:
+        if kind not in KINDS:
+            raise ValueError(f'неизвестный вид псевдопростых: {kind}')
+        if kind in ('carmichael', 'lucas'):
+            names.append(kind)
+        else:
+            names.extend(f'{kind}:{base}' for base in bases)
+    return names
+
+
+# Решето нечётных чисел [lo, hi): наименьший простой делитель spf (0 у простых) и признак
+# критерия Корсельта (n свободно от квадратов и p - 1 | n - 1 для каждого простого p | n).
+# Каждое просеивающее простое делится из остатка rest; после просеивания в rest остаётся 1
+# или единственный простой делитель больше sqrt(hi)
+def _sieve_chunk(lo, hi, korselt):
+    n = np.arange(lo, hi, 2, dtype=np.int64)
+    spf = np.zeros(len(n), dtype=np.int64)
+    ok = np.ones(len(n), dtype=bool) if korselt else None
+    rest = n.copy() if korselt else None
+    for p in sieve_of_eratosthenes(math.isqrt(hi - 1))[1:]:
+        first = max(3 * p, -(-lo // p) * p)  # само p — простое, его не трогаем
+        if first % 2 == 0:
+            first += p
+        if first >= hi:
+            continue
+        i = (first - lo) // 2
+        view = spf[i::p]
+        view[view == 0] = p
+        if korselt:
+            r = rest[i::p]
+            r //= p
+            ok[i::p] &= (r % p != 0) & ((n[i::p] - 1) % (p - 1) == 0)
+    if not korselt:
+        return n, spf, None
+    big = rest > 1
+    ok[big] &= (n[big] - 1) % (rest[big] - 1) == 0
+    return n, spf, ok & (spf != 0)
+
+
+# Эйлеров псевдопростой (Эйлер-Якоби) по основанию a: a^((n-1)/2) ≡ (a/n) (mod n)
+def _is_euler_probable_prime(n, a):
+    j = jacobi(a, n)
+    return j != 0 and pow(a, (n - 1) // 2, n) == j % n
+
+
+# Один кусок [lo, hi) (lo нечётное): {раздел: список псевдопростых}
+def _run_chunk(args):
+    from .batch import is_fermat_probable_prime_batch, is_lucas_probable_prime_batch
+
+    lo, hi, kinds, bases = args
+    n, spf, carmichael = _sieve_chunk(lo, hi, 'carmichael' in kinds)
+    found = {}
+    if carmichael is not None:
+        found['carmichael'] = n[carmichael].tolist()
+    composite = n[spf != 0].astype(np.uint64)
+    for base in bases if {'fermat', 'strong', 'euler'} & set(kinds) else ():
+        # Сильные и эйлеровы псевдопростые по основанию — подмножество псевдопростых Ферма по нему
+        fermat = composite[is_fermat_probable_prime_batch(composite, base)].tolist()
+        if 'fermat' in kinds:
+            found[f'fermat:{base}'] = fermat
+        if 'strong' in kinds:
+            found[f'strong:{base}'] = [m for m in fermat if is_strong_probable_prime(m, base)]
+        if 'euler' in kinds:
+            found[f'euler:{base}'] = [m for m in fermat if _is_euler_probable_prime(m, base)]
+    if 'lucas' in kinds:
+        found['lucas'] = composite[is_lucas_probable_prime_batch(composite)].tolist()
+    return found
+
+
+def _run_chunks(tasks, workers):
+    if workers == 1:
+        yield from map(_run_chunk, tasks)
+        return
+    with Pool(workers or os.cpu_count()) as pool:
+        yield from pool.imap_unordered(_run_chunk, tasks)
+
+
+# Псевдопростые из [start, limit) кусками по chunk_size нечётных чисел в пуле процессов:
+# {раздел: отсортированный список}. Чётных псевдопростых эти тесты не дают, так что
+# просеиваются только нечётные числа
+def generate(limit, kinds=KINDS, bases=(2,), workers=None, chunk_size=CHUNK_SIZE, start=3):
+    if np is None:
+        raise ImportError('для построения каталога нужен NumPy')
+    catalog = {name: [] for name in section_names(kinds, bases)}
+    start = max(start, 3) | 1
+    tasks = [(lo, min(lo + 2 * chunk_size, limit), tuple(kinds), tuple(bases))
+             for lo in range(start, limit, 2 * chunk_size)]
+    for found in _run_chunks(tasks, workers):
+        for name, numbers in found.items():
+            catalog[name].extend(numbers)
+    return {name: sorted(numbers) for name, numbers in catalog.items()}
+
+
+# Атомарная запись каталога (как у контрольных точек: временный файл и замена)
+def save_catalog(path, catalog, start, limit):
+    entries = []
+    body = b''
+    offset = _HEADER.size + _ENTRY.size * len(catalog)
+    for name, numbers in catalog.items():
+        data = array('Q', numbers)
+        if sys.byteorder == 'big':
+            data.byteswap()
+        data = data.tobytes()
+        entries.append(_ENTRY.pack(name.encode('ascii'), offset + len(body), len(numbers), zlib.crc32(data)))
+        body += data
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, start, limit, len(catalog)))
+        f.write(b''.join(entries))
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# Заголовок и оглавление каталога: (start, limit, {раздел: (смещение, длина, crc)})
+def read_index(path):
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f'{path}: файл каталога обрезан')
+        magic, version, start, limit, count = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path}: не каталог псевдопростых')
+        table = f.read(_ENTRY.size * count)
+    sections = {}
+    for k in range(count):
+        name, offset, length, crc = _ENTRY.unpack_from(table, k * _ENTRY.size)
+        sections[name.rstrip(b'\0').decode('ascii')] = (offset, length, crc)
+    return start, limit, sections
+
+
+# Чтение каталога: (start, limit, {раздел: список}); names ограничивает набор разделов
+def load_catalog(path, names=None):
+    start, limit, sections = read_index(path)
+    catalog = {}
+    with open(path, 'rb') as f:
+        for name, (offset, length, crc) in sections.items():
+            if names is not None and name not in names:
+                continue
+            f.seek(offset)
+            data = f.read(8 * length)
+            if len(data) != 8 * length or zlib.crc32(data) != crc:
+                raise ValueError(f'{path}: раздел {name} повреждён')
+            numbers = array('Q')
+            numbers.frombytes(data)
+            if sys.byteorder == 'big':
+                numbers.byteswap()
+            catalog[name] = numbers.tolist()
+    return start, limit, catalog
+
+
+# Псевдопростые меньше limit по разделам из файла path; если файла нет или он покрывает меньший
+# диапазон или не все разделы, каталог строится заново и сохраняется
+def catalog(path, limit, kinds=KINDS, bases=(2,), workers=None):
+    names = section_names(kinds, bases)
+    if os.path.exists(path):
+        start, saved_limit, sections = read_index(path)
+        if start <= 3 and saved_limit >= limit and set(names) <= set(sections):
+            _, _, found = load_catalog(path, names)
+            return {name: [n for n in found[name] if n < limit] for name in names}
+    found = generate(limit, kinds, bases, workers)
+    save_catalog(path, found, 3, limit)
+    return found
+
+
+# Числа Кармайкла меньше limit из каталога path — для экспериментальных скриптов. Каталог строится
+# в том же процессе: скрипты считают на верхнем уровне, а пул процессов со spawn (Windows, macOS)
+# импортировал бы их заново
+def carmichael_numbers(limit, path='pseudoprimes.bin'):
+    return catalog(path, limit, kinds=('carmichael',), workers=1)['carmichael']
+
+
+if __name__ == '__main__':
+    # python -m primality.pseudoprimes LIMIT PATH [WORKERS]
+    limit, path = int(sys.argv[1]), sys.argv[2]
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    begin = time.perf_counter()
+    found = generate(limit, workers=workers)
+    save_catalog(path, found, 3, limit)
+    for name, numbers in found.items():
+        print(f'{name}: {len(numbers)}')
+    print(f'Общее время: {time.perf_counter() - begin:.2f} с')
@@ -0,0 +1,46 @@
+import importlib
+
+# Реестр тестов простоты: имя -> 'модуль:функция' внутри пакета (или сама функция).
+# Модуль импортируется при первом обращении к тесту, так что реестр ничего не загружает заранее.
+# Все тесты принимают одно число n, кроме BOUND_TESTS
+TESTS = {
+    'lucas': 'lucas_lehmer:is_prime_lucas',
+    'lucas_test': 'lucas_test:is_prime_lucas_test',
+    'miller_rabin': 'miller_rabin:is_prime_miller_rabin',
+    'solovay_strassen': 'solovay_strassen:is_prime_solovay_strassen',
+    'fermat': 'fermat:is_prime_fermat',
+    'bpsw': 'bpsw:is_prime_bpsw',
+    'sieve': 'sieve:is_prime_sieve',
+    'eratosthenes': 'sieve:sieve_of_eratosthenes',
+}
+# Тесты, аргумент которых — верхняя граница (решето строит список простых до n), а не проверяемое число
+BOUND_TESTS = {'eratosthenes'}
+# Наибольший размер проверяемого числа (бит), на котором тест ещё применим: is_prime_sieve за пределом
+# оракула просеивает окно с простыми до sqrt(n), тесту Лукаса нужно разложение n - 1
+MAX_BITS = {'sieve': 48, 'lucas_test': 64}
+
+_loaded = {}
+
+
+# Функция теста по имени из TESTS
+def get_test(name):
+    if name not in _loaded:
+        if name not in TESTS:
+            raise ValueError(f'неизвестный тест: {name} (есть: {", ".join(TESTS)})')
+        spec = TESTS[name]
+        if not callable(spec):
+            module, attr = spec.split(':')
+            spec = getattr(importlib.import_module(f'.{module}', __package__), attr)
+        _loaded[name] = spec
+    return _loaded[name]
+
+
+# Несколько тестов сразу: {имя: функция}, по умолчанию все из реестра
+def get_tests(names=None):
+    return {name: get_test(name) for name in (TESTS if names is None else names)}
+
+
+# Добавление или замена теста: func — функция или строка 'модуль:функция' внутри пакета
+def register(name, func):
+    TESTS[name] = func
+    _loaded.pop(name, None)
@@ -0,0 +1,82 @@
+import os
+
+# Куда выводятся графики экспериментов. Переменные окружения действуют, если в Report не передано явно:
+#   PRIMALITY_PLOTS — каталог для файлов (по умолчанию plots); off — графики не строятся вовсе;
+#   PRIMALITY_PLOT_FORMAT — форматы через запятую: png, svg, pdf (pdf — один многостраничный отчёт
+#   на скрипт) или show — окна matplotlib, как раньше
+PLOTS_ENV = 'PRIMALITY_PLOTS'
+FORMAT_ENV = 'PRIMALITY_PLOT_FORMAT'
+DEFAULT_DIRECTORY = 'plots'
+DEFAULT_FORMATS = ('png',)
+FORMATS = ('png', 'svg', 'pdf', 'show')
+DPI = 120
+
+
+def _formats(value):
+    formats = tuple(f.strip().lower() for f in value.split(',') if f.strip()) if isinstance(value, str) else tuple(value)
+    for f in formats:
+        if f not in FORMATS:
+            raise ValueError(f'неизвестный формат графиков: {f} (есть: {", ".join(FORMATS)})')
+    return formats or DEFAULT_FORMATS
+
+
+# Графики одного скрипта. matplotlib импортируется только при первом pyplot(), с бэкендом Agg
+# (без окон), а show(имя) вместо plt.show() сохраняет текущую фигуру в файлы
+# {directory}/{name}-{имя}.{формат} или страницей в {directory}/{name}.pdf и закрывает её.
+# При enabled=False скрипт пропускает графики (if report.enabled) и matplotlib не загружается
+class Report:
+    def __init__(self, name, directory=None, formats=None):
+        directory = os.environ.get(PLOTS_ENV, DEFAULT_DIRECTORY) if directory is None else directory
+        self.name = name
+        self.enabled = directory.lower() not in ('off', 'none', '0', '')
+        self.directory = directory
+        self.formats = _formats(os.environ.get(FORMAT_ENV, ','.join(DEFAULT_FORMATS)) if formats is None else formats)
+        self.saved = []
+        self._pyplot = None
+        self._pages = None
+        self._count = 0
+
+    def pyplot(self):
+        if self._pyplot is None:
+            import matplotlib
+            if 'show' not in self.formats:
+                matplotlib.use('Agg')
+            import matplotlib.pyplot
+            self._pyplot = matplotlib.pyplot
+        return self._pyplot
+
+    def _path(self, suffix):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'{self.name}{suffix}')
+        self.saved.append(path)
+        return path
+
+    # Сохранение (или показ) текущей фигуры; без имени фигуры нумеруются по порядку
+    def show(self, title=None):
+        plt = self.pyplot()
+        self._count += 1
+        title = title or f'{self._count:02d}'
+        figure = plt.gcf()
+        for fmt in self.formats:
+            if fmt == 'show':
+                plt.show()
+            elif fmt == 'pdf':
+                if self._pages is None:
+                    from matplotlib.backends.backend_pdf import PdfPages
+                    self._pages = PdfPages(self._path('.pdf'))
+                self._pages.savefig(figure)
+            else:
+                figure.savefig(self._path(f'-{title}.{fmt}'), format=fmt, dpi=DPI, bbox_inches='tight')
+        plt.close(figure)
+
+    # Завершение многостраничного отчёта
+    def close(self):
+        if self._pages is not None:
+            self._pages.close()
+            self._pages = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,198 @@
+import argparse
+import csv
+import gc
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from .bench import MAX_TIME_NS, MIN_REPEAT, _run, calibrate, environment, summarize
+from .registry import BOUND_TESTS, TESTS, get_test
+
+# Набор по умолчанию — как в Experiment.py
+DEFAULT_TESTS = ('lucas', 'miller_rabin', 'solovay_strassen', 'eratosthenes', 'fermat')
+DEFAULT_RANGES = ((1000, 10000), (10000, 100000), (100000, 1000000))
+SAMPLES = 100
+SEED = 45
+# Замеры прекращаются, когда половина 95 % доверительного интервала не больше TARGET от среднего
+TARGET = 0.05
+MAX_REPEAT = 50
+FORMATS = ('table', 'json', 'csv')
+
+
+# Диапазон 'LO-HI' (или 'LO:HI'); допускаются степени: 10**6, 2**64
+def parse_range(text):
+    parts = text.replace(':', '-').split('-')
+    if len(parts) != 2:
+        raise argparse.ArgumentTypeError(f'диапазон должен иметь вид LO-HI: {text}')
+    try:
+        lo, hi = (_parse_int(part) for part in parts)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'не число в диапазоне: {text}') from None
+    if not 0 <= lo <= hi:
+        raise argparse.ArgumentTypeError(f'пустой диапазон: {text}')
+    return lo, hi
+
+
+def _parse_int(text):
+    base, _, power = text.strip().partition('**')
+    return int(base) ** int(power) if power else int(base)
+
+
+# Входы одного замера: samples случайных чисел из [lo, hi], свои для каждого номера замера k
+# (одинаковые для всех тестов); тесту из BOUND_TESTS — одна верхняя граница
+def sample_inputs(name, lo, hi, samples, seed, k):
+    if name in BOUND_TESTS:
+        return [hi]
+    rng = random.Random(f'{seed}:{lo}:{hi}:{k}')
+    return [rng.randint(lo, hi) for _ in range(samples)]
+
+
+# Одно задание (тест, диапазон): число вызовов в замере подбирается на первом наборе входов,
+# затем каждый замер идёт на новом наборе, пока доверительный интервал не станет уже target
+# (но не меньше MIN_REPEAT замеров), не кончится бюджет budget_ns или не наберётся max_repeat замеров.
+# Время — нс на один вход
+def run_job(args):
+    name, lo, hi, samples, seed, target, max_repeat, budget_ns = args
+    func = get_test(name)
+    random.seed(f'{seed}:{name}:{lo}')  # для вероятностных тестов
+
+    def runner(inputs):
+        def run_all():
+            for n in inputs:
+                func(n)
+        return run_all
+
+    inputs = sample_inputs(name, lo, hi, samples, seed, 0)
+    number = calibrate(runner(inputs))
+    deadline = time.perf_counter_ns() + budget_ns
+    values = []
+    met = False
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(values) < max_repeat:
+            inputs = sample_inputs(name, lo, hi, samples, seed, len(values))
+            values.append(_run(runner(inputs), (), number) / (number * len(inputs)))
+            if len(values) >= MIN_REPEAT:
+                stats = summarize(values)
+                met = stats['ci_high_ns'] - stats['mean_ns'] <= target * stats['mean_ns']
+                if met or time.perf_counter_ns() >= deadline:
+                    break
+    finally:
+        if enabled:
+            gc.enable()
+    stats = summarize(values)
+    stats.update(number=number, inputs=len(inputs), target_met=met,
+                 relative_ci=(stats['ci_high_ns'] - stats['mean_ns']) / stats['mean_ns'])
+    return name, lo, hi, stats
+
+
+def _run_jobs(tasks, workers):
+    if workers == 1:
+        yield from map(run_job, tasks)
+        return
+    with Pool(workers or os.cpu_count()) as pool:
+        yield from pool.imap_unordered(run_job, tasks)
+
+
+def _format_seconds(seconds):
+    seconds = int(seconds)
+    return f'{seconds // 60}:{seconds % 60:02d}'
+
+
+# Строка прогресса в stderr: выполнено заданий, прошло времени и оценка оставшегося
+# (в терминале строка обновляется на месте, в файл пишется построчно)
+def _progress(done, total, started, budget):
+    elapsed = time.perf_counter() - started
+    left = elapsed / done * (total - done) if done else float('inf')
+    if budget is not None:
+        left = min(left, max(budget - elapsed, 0.0))
+    eta = _format_seconds(left) if left != float('inf') else '?'
+    end = '\n' if done == total or not sys.stderr.isatty() else ''
+    print(f'\r[{done}/{total}] {_format_seconds(elapsed)} прошло, осталось ~{eta}  ', end=end, file=sys.stderr,
+          flush=True)
+
+
+# Все задания: {тест: {'lo-hi': сводка}}. budget (с) делится поровну между заданиями с учётом
+# числа процессов; без него на задание отводится bench.MAX_TIME_NS
+def run(tests=DEFAULT_TESTS, ranges=DEFAULT_RANGES, samples=SAMPLES, seed=SEED, workers=1, target=TARGET,
+        max_repeat=MAX_REPEAT, budget=None, progress=True):
+    for name in tests:
+        get_test(name)  # неизвестное имя — ошибка до запуска
+    jobs = [(name, lo, hi) for name in tests for lo, hi in ranges]
+    parallel = workers or os.cpu_count()
+    budget_ns = MAX_TIME_NS if budget is None else int(budget * 1e9 * min(parallel, len(jobs)) / len(jobs))
+    tasks = [(name, lo, hi, samples, seed, target, max_repeat, budget_ns) for name, lo, hi in jobs]
+    results = {name: {} for name in tests}
+    started = time.perf_counter()
+    if progress:
+        _progress(0, len(tasks), started, budget)
+    for done, (name, lo, hi, stats) in enumerate(_run_jobs(tasks, workers), 1):
+        results[name][f'{lo}-{hi}'] = stats
+        if progress:
+            _progress(done, len(tasks), started, budget)
+    # Порядок диапазонов — как в запросе, а не как завершались задания
+    return {name: {f'{lo}-{hi}': results[name][f'{lo}-{hi}'] for lo, hi in ranges} for name in tests}
+
+
+def write_table(results, stream):
+    print(f'{"тест":<18} {"диапазон":<22} {"среднее, мкс":>13} {"±95 %":>8} {"замеров":>8}  цель', file=stream)
+    for name, cases in results.items():
+        for label, s in cases.items():
+            print(f'{name:<18} {label:<22} {s["mean_ns"] / 1e3:>13.3f} {100 * s["relative_ci"]:>7.1f}% '
+                  f'{s["samples"]:>8}  {"да" if s["target_met"] else "нет"}', file=stream)
+
+
+def write_csv(results, stream):
+    fields = ('mean_ns', 'median_ns', 'min_ns', 'stdev_ns', 'ci_low_ns', 'ci_high_ns', 'samples', 'rejected',
+              'number', 'inputs', 'target_met')
+    writer = csv.writer(stream)
+    writer.writerow(('test', 'range') + fields)
+    for name, cases in results.items():
+        for label, s in cases.items():
+            writer.writerow((name, label) + tuple(s[f] for f in fields))
+
+
+def write_json(results, stream):
+    json.dump({'environment': environment(), 'results': results}, stream, ensure_ascii=False, indent=2)
+    stream.write('\n')
+
+
+WRITERS = {'table': write_table, 'json': write_json, 'csv': write_csv}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m primality.runner',
+                                     description='Замеры времени тестов простоты на диапазонах чисел')
+    parser.add_argument('-t', '--tests', nargs='+', choices=sorted(TESTS), default=list(DEFAULT_TESTS),
+                        metavar='TEST', help=f'тесты из реестра: {", ".join(TESTS)}')
+    parser.add_argument('-r', '--ranges', nargs='+', type=parse_range, default=list(DEFAULT_RANGES),
+                        metavar='LO-HI', help='диапазоны чисел, например 1000-10000 10**6-10**7')
+    parser.add_argument('-n', '--samples', type=int, default=SAMPLES, help='случайных чисел в одном замере')
+    parser.add_argument('-s', '--seed', default=SEED, help='начальное значение генератора входов')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='процессов (0 — по числу ядер; параллельные замеры мешают друг другу)')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='table')
+    parser.add_argument('-o', '--output', help='файл для результатов (по умолчанию stdout)')
+    parser.add_argument('--budget', type=float, help='бюджет времени на все замеры, с')
+    parser.add_argument('--target', type=float, default=TARGET,
+                        help='достаточная относительная ширина 95 %% интервала (половина), по умолчанию 0.05')
+    parser.add_argument('--max-repeat', type=int, default=MAX_REPEAT, help='максимум замеров на задание')
+    parser.add_argument('-q', '--quiet', action='store_true', help='без строки прогресса')
+    args = parser.parse_args(argv)
+    if args.samples < 1 or args.max_repeat < MIN_REPEAT:
+        parser.error(f'--samples должен быть не меньше 1, --max-repeat — не меньше {MIN_REPEAT}')
+    results = run(args.tests, args.ranges, args.samples, args.seed, args.workers or None, args.target,
+                  args.max_repeat, args.budget, not args.quiet)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            WRITERS[args.format](results, f)
+    else:
+        WRITERS[args.format](results, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+import argparse
+import csv
+import gc
+import json
+import math
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from .bench import MAX_TIME_NS, MIN_SAMPLE_NS, _run, calibrate, environment, summarize
+from .bpsw import is_prime_bpsw
+from .registry import BOUND_TESTS, MAX_BITS, TESTS, get_test
+from .runner import SEED, _progress
+
+try:
+    import gmpy2
+except ImportError:  # без gmpy2 простые ищутся перебором случайных нечётных через BPSW (на 8192 битах — минуты)
+    gmpy2 = None
+
+# Размеры входов в битах: на малых числах время съедают накладные расходы вызова, асимптотика
+# видна только с сотен бит
+BITS = (64, 128, 256, 512, 1024, 2048, 4096, 8192)
+# Виды входов: случайные нечётные (в основном составные — ранний выход) и случайные простые (полный тест)
+KINDS = ('odd', 'prime')
+# Входов на размер и вид; на 8192 битах один полный тест — секунды, поэтому немного
+SAMPLES = 4
+REPEAT = 5
+# Показатель сложности подбирается по размерам не меньше FIT_FROM бит
+FIT_FROM = 512
+FORMATS = ('table', 'json', 'csv')
+
+
+# Случайное нечётное число ровно из bits бит
+def random_odd(bits, rng):
+    return rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+
+
+# Случайное простое ровно из bits бит
+def random_prime(bits, rng):
+    while True:
+        n = random_odd(bits, rng)
+        if gmpy2 is not None:
+            n = int(gmpy2.next_prime(n - 1))  # наименьшее простое >= n
+            if n.bit_length() == bits:
+                return n
+        elif is_prime_bpsw(n):
+            return n
+
+
+# Входы одного размера и вида; зависят только от (seed, kind, bits)
+def make_inputs(kind, bits, samples, seed=SEED):
+    rng = random.Random(f'{seed}:{kind}:{bits}')
+    make = random_prime if kind == 'prime' else random_odd
+    return [make(bits, rng) for _ in range(samples)]
+
+
+# Тесты, применимые к числам из bits бит
+def scalable_tests(tests, bits):
+    return [name for name in tests if name not in BOUND_TESTS and bits <= MAX_BITS.get(name, bits)]
+
+
+# Время func на наборе входов (нс на вход) и пропускная способность (тестов в секунду).
+# Если один проход длиннее MIN_SAMPLE_NS, он сам становится первым замером (на больших числах
+# отдельный разогрев стоил бы секунды), иначе число повторов подбирается как в bench.measure.
+# Замеры идут, пока не набрано repeat или не вышло budget_ns
+def time_inputs(func, inputs, repeat=REPEAT, budget_ns=MAX_TIME_NS):
+    def run_all():
+        for n in inputs:
+            func(n)
+
+    deadline = time.perf_counter_ns() + budget_ns
+    first = _run(run_all, (), 1)
+    if first >= MIN_SAMPLE_NS:
+        number, samples = 1, [first / len(inputs)]
+    else:
+        number, samples = calibrate(run_all, warmup_ns=0), []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(samples) < repeat and (not samples or time.perf_counter_ns() < deadline):
+            samples.append(_run(run_all, (), number) / (number * len(inputs)))
+    finally:
+        if enabled:
+            gc.enable()
+    stats = summarize(samples)
+    stats.update(number=number, inputs=len(inputs), per_second=1e9 / stats['mean_ns'])
+    return stats
+
+
+# Одно задание — размер и вид входов: входы строятся один раз и прогоняются через все применимые тесты
+def _run_size(args):
+    kind, bits, tests, samples, seed, repeat, budget_ns = args
+    started = time.perf_counter()
+    inputs = make_inputs(kind, bits, samples, seed)
+    generated = time.perf_counter() - started
+    timings = {}
+    for name in scalable_tests(tests, bits):
+        random.seed(f'{seed}:{name}:{kind}:{bits}')  # для вероятностных тестов
+        timings[name] = time_inputs(get_test(name), inputs, repeat, budget_ns)
+    return kind, bits, generated, timings
+
+
+def _run_sizes(tasks, workers):
+    if workers == 1:
+        yield from map(_run_size, tasks)
+        return
+    with Pool(workers or os.cpu_count()) as pool:
+        yield from pool.imap_unordered(_run_size, tasks)
+
+
+# Показатель степени a в time ~ bits^a: наклон прямой МНК через точки (log bits, log time).
+# points — [(bits, нс)]; меньше двух точек — None
+def fit_exponent(points):
+    if len(points) < 2:
+        return None
+    xs = [math.log(bits) for bits, _ in points]
+    ys = [math.log(ns) for _, ns in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+
+
+# Показатели между соседними размерами: {bits: показатель на отрезке от предыдущего размера до bits}.
+# Рост показателя с размером — переход от накладных расходов к стоимости арифметики
+def local_exponents(points):
+    return {b: math.log(t / s) / math.log(b / a) for (a, s), (b, t) in zip(points, points[1:])}
+
+
+# Показатели для каждого теста и вида входов: по размерам от fit_from бит, по всем размерам и локальные
+def exponents(results, fit_from=FIT_FROM):
+    fitted = {}
+    for name, kinds in results.items():
+        for kind, sizes in kinds.items():
+            points = sorted((bits, stats['mean_ns']) for bits, stats in sizes.items())
+            fitted.setdefault(name, {})[kind] = {
+                'exponent': fit_exponent([p for p in points if p[0] >= fit_from]),
+                'exponent_all': fit_exponent(points),
+                'local': local_exponents(points),
+            }
+    return fitted
+
+
+# Замеры по размерам: {'results': {тест: {вид: {биты: сводка}}}, 'exponents': ...,
+# 'generation_s': {вид: {биты: секунды на построение входов}}}. budget — секунд на одну пару
+# (тест, размер); без него bench.MAX_TIME_NS. Большие размеры запускаются первыми, как в sweep
+def scale(tests=None, bits=BITS, kinds=KINDS, samples=SAMPLES, seed=SEED, workers=1, repeat=REPEAT,
+          budget=None, fit_from=FIT_FROM, progress=True):
+    tests = [name for name in TESTS if name not in BOUND_TESTS] if tests is None else list(tests)
+    for name in tests:
+        get_test(name)  # неизвестное имя — ошибка до запуска
+    budget_ns = MAX_TIME_NS if budget is None else int(budget * 1e9)
+    tasks = [(kind, b, tests, samples, seed, repeat, budget_ns)
+             for b in sorted(bits, reverse=True) for kind in kinds]
+    results = {name: {kind: {} for kind in kinds} for name in tests}
+    generation = {kind: {} for kind in kinds}
+    started = time.perf_counter()
+    if progress:
+        _progress(0, len(tasks), started, None)
+    for done, (kind, b, generated, timings) in enumerate(_run_sizes(tasks, workers), 1):
+        generation[kind][b] = generated
+        for name, stats in timings.items():
+            results[name][kind][b] = stats
+        if progress:
+            _progress(done, len(tasks), started, None)
+    # Тесты, не применимые ни к одному из размеров (MAX_BITS), в отчёт не попадают
+    results = {name: {kind: dict(sorted(sizes.items())) for kind, sizes in by_kind.items()}
+               for name, by_kind in results.items() if any(by_kind.values())}
+    return {'results': results, 'exponents': exponents(results, fit_from), 'generation_s': generation}
+
+
+def _exponent(value):
+    return f'{value:.2f}' if value is not None else '—'
+
+
+def write_table(report, stream):
+    results, fitted = report['results'], report['exponents']
+    print(f'{"тест":<18} {"вход":<6} {"бит":>5} {"среднее, мс":>13} {"тестов/с":>11} {"лок. показатель":>16}',
+          file=stream)
+    for name, kinds in results.items():
+        for kind, sizes in kinds.items():
+            local = fitted[name][kind]['local']
+            for bits, s in sizes.items():
+                print(f'{name:<18} {kind:<6} {bits:>5} {s["mean_ns"] / 1e6:>13.4f} {s["per_second"]:>11.1f} '
+                      f'{_exponent(local.get(bits)):>16}', file=stream)
+    print(file=stream)
+    print(f'{"тест":<18} {"вход":<6} {"показатель":>11} {"по всем":>8}', file=stream)
+    for name, kinds in fitted.items():
+        for kind, fit in kinds.items():
+            print(f'{name:<18} {kind:<6} {_exponent(fit["exponent"]):>11} {_exponent(fit["exponent_all"]):>8}',
+                  file=stream)
+
+
+def write_csv(report, stream):
+    fields = ('mean_ns', 'median_ns', 'min_ns', 'stdev_ns', 'ci_low_ns', 'ci_high_ns', 'samples', 'number',
+              'inputs', 'per_second')
+    writer = csv.writer(stream)
+    writer.writerow(('test', 'kind', 'bits') + fields + ('local_exponent', 'exponent'))
+    for name, kinds in report['results'].items():
+        for kind, sizes in kinds.items():
+            fit = report['exponents'][name][kind]
+            for bits, s in sizes.items():
+                writer.writerow((name, kind, bits) + tuple(s[f] for f in fields)
+                                + (fit['local'].get(bits), fit['exponent']))
+
+
+def write_json(report, stream):
+    json.dump(dict(report, environment=environment()), stream, ensure_ascii=False, indent=2)
+    stream.write('\n')
+
+
+WRITERS = {'table': write_table, 'json': write_json, 'csv': write_csv}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m primality.scaling',
+                                     description='Масштабирование тестов простоты по длине входа в битах')
+    parser.add_argument('-t', '--tests', nargs='+', choices=sorted(set(TESTS) - BOUND_TESTS), metavar='TEST',
+                        help='тесты из реестра (по умолчанию все, кроме решета до n)')
+    parser.add_argument('-b', '--bits', nargs='+', type=int, default=list(BITS), help='размеры входов в битах')
+    parser.add_argument('-k', '--kinds', nargs='+', choices=KINDS, default=list(KINDS))
+    parser.add_argument('-n', '--samples', type=int, default=SAMPLES, help='входов на размер и вид')
+    parser.add_argument('-s', '--seed', default=SEED)
+    parser.add_argument('-w', '--workers', type=int, default=1, help='процессов (0 — по числу ядер)')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='наибольшее число замеров на пару')
+    parser.add_argument('--budget', type=float, help='секунд на замеры одного теста на одном размере')
+    parser.add_argument('--fit-from', type=int, default=FIT_FROM, help='наименьший размер для показателя')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='table')
+    parser.add_argument('-o', '--output', help='файл для результатов (по умолчанию stdout)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='без строки прогресса')
+    args = parser.parse_args(argv)
+    if args.samples < 1 or args.repeat < 1 or min(args.bits) < 2:
+        parser.error('--samples и --repeat должны быть не меньше 1, размеры — не меньше 2 бит')
+    report = scale(args.tests, args.bits, args.kinds, args.samples, args.seed, args.workers or None,
+                   args.repeat, args.budget, args.fit_from, not args.quiet)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            WRITERS[args.format](report, f)
+    else:
+        WRITERS[args.format](report, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
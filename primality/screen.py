@@ -0,0 +1,15 @@
+import functools
+
+
+# Необязательный предварительный фильтр для теста простоты (см. prefilter.Prefilter): у обёрнутой
+# функции появляется параметр prefilter=None. Если фильтр задан и решил n (малые делители),
+# основной тест не запускается. Модуль без зависимостей, чтобы тесты не загружали решето и NumPy
+def prefiltered(test):
+    @functools.wraps(test)
+    def wrapper(n, *args, prefilter=None, **kwargs):
+        if prefilter is not None:
+            verdict = prefilter(n)
+            if verdict is not None:
+                return verdict
+        return test(n, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,179 @@
+import math
+from itertools import compress
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него упаковка битов идёт на чистом Python
+    np = None
+
+
+# Размер окна сегментированного решета в нечётных числах (256 КБ — порядок кэша L2)
+SEGMENT_SIZE = 1 << 18
+
+
+# Нечётные простые до limit включительно — база для просеивания сегментов
+def _base_primes(limit):
+    if limit < 3:
+        return []
+    flags = bytearray([1]) * ((limit + 1) // 2)  # flags[i] соответствует числу 2*i + 1
+    flags[0] = 0
+    for i in range(1, (math.isqrt(limit) - 1) // 2 + 1):
+        if flags[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            flags[start::p] = bytes(len(range(start, len(flags), p)))
+    return list(compress(range(1, limit + 1, 2), flags))
+
+
+# Сегментированное решето по нечётным числам из [low, high).
+# Возвращает поток пар (start, flags), где flags[i] == 1 <=> start + 2*i простое
+def iter_segments(high, low=0, segment_size=SEGMENT_SIZE):
+    start = max(low, 1) | 1
+    if start >= high:
+        return
+    base = _base_primes(math.isqrt(high - 1))
+    while start < high:
+        end = min(start + 2 * segment_size, high)
+        size = (end - start + 1) // 2
+        flags = bytearray([1]) * size
+        if start == 1:
+            flags[0] = 0  # 1 не является простым
+        for p in base:
+            if p * p >= end:
+                break
+            # Первое нечётное кратное p в окне, но не меньше p*p
+            m = max(p * p, (start + p - 1) // p * p)
+            if m % 2 == 0:
+                m += p
+            i = (m - start) // 2
+            if i < size:
+                flags[i::p] = bytes(len(range(i, size, p)))
+        yield start, flags
+        start = end if end % 2 else end + 1
+
+
+# Поток простых чисел из отрезка [low, n]
+def iter_primes(n, low=2, segment_size=SEGMENT_SIZE):
+    if low <= 2 <= n:
+        yield 2
+    for start, flags in iter_segments(n + 1, low, segment_size):
+        yield from compress(range(start, start + 2 * len(flags), 2), flags)
+
+
+# 1.4. Решето Эратосфена
+# Список всех простых чисел до n включительно (интерфейс прежней функции)
+def sieve_of_eratosthenes(n):
+    return list(iter_primes(n))
+
+
+# Проверка простоты одного n: просеивается только окно из одного числа,
+# поэтому нужны лишь простые до sqrt(n), а не решето до n
+def _is_prime_window(n):
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    for _, flags in iter_segments(n + 1, n):
+        return bool(flags[0])
+    return False
+
+
+# Проверка простоты по общему растущему решету (см. SieveOracle): повторные запросы —
+# просто чтение бита; за пределом памяти оракула — окно из одного числа
+def is_prime_sieve(n):
+    return ORACLE.is_prime(n)
+
+
+# Упаковка байтовых флагов (0/1) в биты, младший бит — первое число
+def _pack_bits(flags):
+    if np is not None:
+        return np.packbits(np.frombuffer(flags, dtype=np.uint8), bitorder='little').tobytes()
+    packed = bytearray((len(flags) + 7) // 8)
+    tail = bytes(len(packed) * 8 - len(flags))
+    data = bytes(flags) + tail
+    for j in range(len(packed)):
+        x = int.from_bytes(data[8 * j:8 * j + 8], 'little')
+        # Умножение собирает младшие биты восьми байтов в старший байт произведения
+        packed[j] = (x * 0x0102040810204080) >> 56 & 0xFF
+    return bytes(packed)
+
+
+# Битовая карта простоты нечётных чисел до n: один бит на нечётное число (n/16 байт).
+# Индексируется как прежний список флагов: bitmap[m] -> True/False
+class PrimeBitmap:
+    def __init__(self, n, segment_size=SEGMENT_SIZE):
+        if segment_size % 8:
+            raise ValueError('segment_size должен быть кратен 8')
+        self.limit = n
+        self.bits = b''.join(_pack_bits(flags) for _, flags in iter_segments(n + 1, 1, segment_size))
+
+    def __len__(self):
+        return self.limit + 1
+
+    def __getitem__(self, m):
+        if m < 0 or m > self.limit:
+            raise IndexError(m)
+        if m % 2 == 0:
+            return m == 2
+        k = m >> 1
+        return bool(self.bits[k >> 3] >> (k & 7) & 1)
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+# Начальная граница оракула и предел его памяти по умолчанию (16 МБ — нечётные числа до 2.7 * 10^8)
+ORACLE_START = 1 << 16
+ORACLE_MAX_BYTES = 1 << 24
+
+
+# Оракул простоты на общей битовой карте нечётных чисел (формат PrimeBitmap.bits).
+# Запрос больше текущей границы достраивает решето новыми сегментами: граница по меньшей мере
+# удваивается, поэтому на последовательность запросов решето строится O(log) раз.
+# Карта не растёт больше max_bytes; за этой границей ответ даёт окно из одного числа
+class SieveOracle:
+    def __init__(self, max_bytes=ORACLE_MAX_BYTES, segment_size=SEGMENT_SIZE):
+        if segment_size % 8:
+            raise ValueError('segment_size должен быть кратен 8')
+        self.max_bytes = max_bytes
+        self.segment_size = segment_size
+        self.limit = -1  # карта покрывает [0, limit]; limit + 1 всегда кратно 16
+        self.bits = bytearray()
+        self.stats = {'queries': 0, 'grows': 0, 'fallbacks': 0}
+
+    # Дописать сегменты до новой границы (не меньше n и удвоенной старой, не больше предела памяти)
+    def _grow(self, n):
+        limit = min(max(n, 2 * self.limit, ORACLE_START) | 15, 16 * self.max_bytes - 1)
+        for _, flags in iter_segments(limit + 1, self.limit + 1, self.segment_size):
+            self.bits += _pack_bits(flags)
+        self.limit = limit
+        self.stats['grows'] += 1
+
+    def is_prime(self, n):
+        self.stats['queries'] += 1
+        if n > self.limit:
+            if n >= 16 * self.max_bytes:
+                self.stats['fallbacks'] += 1
+                return _is_prime_window(n)
+            self._grow(n)
+        if n < 2:
+            return False
+        if n % 2 == 0:
+            return n == 2
+        k = n >> 1
+        return bool(self.bits[k >> 3] >> (k & 7) & 1)
+
+    __contains__ = is_prime
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+    # Сводка для отчёта: граница, занятая и предельная память, счётчики запросов
+    def report(self):
+        return dict(self.stats, limit=self.limit, nbytes=self.nbytes, max_bytes=self.max_bytes)
+
+
+# Общий оракул для is_prime_sieve
+ORACLE = SieveOracle()
@@ -0,0 +1,27 @@
+import random
+
+from .jacobi import jacobi
+from .screen import prefiltered
+
+
+# 1.3. Тест Соловея-Штрассена
+# Статистический тест на простоту, использующий символ Якоби и вероятностные проверки.
+@prefiltered
+def is_prime_solovay_strassen(n, k=5):
+    if n < 2:
+        return False  # Числа меньше 2 не являются простыми
+    if n == 2:
+        return True  # 2 - простое число
+    if n % 2 == 0:
+        return False  # Четные числа, кроме 2, не являются простыми
+
+    def trial_composite(a):
+        jacobian = jacobi(a, n) % n
+        mod = pow(a, (n - 1) // 2, n)
+        return jacobian == 0 or mod != jacobian
+
+    for _ in range(k):
+        a = random.randrange(2, n)
+        if trial_composite(a):
+            return False  # Составное число
+    return True  # Число прошло все раунды тестирования
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from .lucas_lehmer import lucas_lehmer
+from .sieve import iter_primes
+
+# Сколько значений k перебирать при поиске делителей вида 2kp + 1
+TRIAL_K = 1 << 14
+
+
+# Поиск малого делителя числа 2^p - 1. Любой делитель имеет вид q = 2kp + 1
+# и q ≡ ±1 (mod 8), поэтому проверяются только такие q; q делит 2^p - 1 <=> 2^p ≡ 1 (mod q)
+def trial_factor(p, max_k=TRIAL_K):
+    M = (1 << p) - 1
+    for k in range(1, max_k + 1):
+        q = 2 * k * p + 1
+        if q * q > M:
+            break
+        if q % 8 not in (1, 7):
+            continue
+        if pow(2, p, q) == 1:
+            return q
+    return None
+
+
+# Показатели из [start, stop), для которых ещё нужен тест Лукаса-Лемера:
+# составные p отбрасываются решетом, p с малым делителем 2kp + 1 — пробным делением.
+# Возвращает (список показателей, словарь p -> найденный делитель)
+def candidate_exponents(start, stop, max_k=TRIAL_K):
+    survivors = []
+    factors = {}
+    for p in iter_primes(stop - 1, start):
+        q = trial_factor(p, max_k)
+        if q is None:
+            survivors.append(p)
+        else:
+            factors[p] = q
+    return survivors, factors
+
+
+# Одно задание — простой показатель p: пробное деление, а если делитель не найден — тест Лукаса-Лемера
+def _run_exponent(args):
+    p, max_k, backend = args
+    start_time = time.perf_counter()
+    q = trial_factor(p, max_k)
+    result = q is None and lucas_lehmer(p, backend)
+    return p, result, time.perf_counter() - start_time, q
+
+
+# Параллельный перебор показателей Мерсенна. Результаты (p, простое ли 2^p - 1, время, делитель)
+# отдаются по мере готовности; делитель — найденный пробным делением 2kp + 1 (тогда тест
+# Лукаса-Лемера не запускался) или None. Родитель только просеивает показатели, пробное деление
+# идёт в процессах вместе с тестом. Большие p запускаются первыми — так процессы
+# загружены равномерно и хвост из одного долгого теста в конце не возникает
+def sweep(start, stop, workers=None, max_k=TRIAL_K, backend=None):
+    tasks = [(p, max_k, backend) for p in sorted(iter_primes(stop - 1, start), reverse=True)]
+    if workers == 1:
+        yield from map(_run_exponent, tasks)
+        return
+    with Pool(workers or os.cpu_count()) as pool:
+        yield from pool.imap_unordered(_run_exponent, tasks)
+
+
+if __name__ == '__main__':
+    # python -m primality.sweep START STOP [WORKERS]
+    start, stop = int(sys.argv[1]), int(sys.argv[2])
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    begin = time.perf_counter()
+    factored = 0
+    for p, is_prime, elapsed, factor in sweep(start, stop, workers):
+        if is_prime:
+            print(f'M{p} простое ({elapsed:.3f} с)', flush=True)
+        factored += factor is not None
+    print(f'Отсеяно пробным делением: {factored}')
+    print(f'Общее время: {time.perf_counter() - begin:.2f} с')
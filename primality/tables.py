@@ -0,0 +1,177 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy поиск идёт через bisect по memoryview
+    np = None
+
+from .pseudoprimes import read_index
+from .sieve import SEGMENT_SIZE, _pack_bits, iter_primes, iter_segments
+
+# Таблицы на диске (little-endian), читаются через mmap без загрузки в память:
+#   битовая карта простоты — заголовок и по биту на нечётное число (как PrimeBitmap.bits);
+#   массив простых — заголовок и отсортированные uint64 с выравниванием на 8 байт;
+#   списки псевдопростых — каталог из pseudoprimes (его разделы тоже выровнены)
+BITMAP_MAGIC = b'PRBM'
+PRIMES_MAGIC = b'PRAR'
+VERSION = 1
+_BITMAP_HEADER = struct.Struct('<4sBxxxQ')
+_PRIMES_HEADER = struct.Struct('<4sBxxxQQ')
+
+
+# Атомарная запись через временный файл: write(f) пишет содержимое
+def _write_atomic(path, write):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# Битовая карта простоты нечётных чисел до limit; решето идёт сегментами прямо в файл
+def build_bitmap(path, limit, segment_size=SEGMENT_SIZE):
+    if segment_size % 8:
+        raise ValueError('segment_size должен быть кратен 8')
+
+    def write(f):
+        f.write(_BITMAP_HEADER.pack(BITMAP_MAGIC, VERSION, limit))
+        for _, flags in iter_segments(limit + 1, 1, segment_size):
+            f.write(_pack_bits(flags))
+
+    _write_atomic(path, write)
+
+
+def _flush(f, buffer):
+    if sys.byteorder == 'big':
+        buffer.byteswap()
+    f.write(buffer.tobytes())
+    count = len(buffer)
+    del buffer[:]
+    return count
+
+
+# Отсортированный массив простых до limit; число простых дописывается в заголовок в конце
+def build_primes(path, limit, segment_size=SEGMENT_SIZE):
+    def write(f):
+        f.write(_PRIMES_HEADER.pack(PRIMES_MAGIC, VERSION, limit, 0))
+        count = 0
+        buffer = array('Q')
+        for p in iter_primes(limit):
+            buffer.append(p)
+            if len(buffer) == segment_size:
+                count += _flush(f, buffer)
+        count += _flush(f, buffer)
+        f.seek(0)
+        f.write(_PRIMES_HEADER.pack(PRIMES_MAGIC, VERSION, limit, count))
+
+    _write_atomic(path, write)
+
+
+def _map(path):
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# Отсортированный массив uint64 внутри отображённого файла: len, индексация и поиск за O(log n).
+# С NumPy данные доступны и как массив (array) без копирования
+class MappedArray:
+    def __init__(self, mm, offset, length):
+        if sys.byteorder == 'big' and np is None:
+            raise ValueError('на big-endian платформе для чтения таблиц нужен NumPy')
+        if np is not None:
+            self.array = np.frombuffer(mm, dtype='<u8', count=length, offset=offset)
+            self._items = self.array
+        else:
+            self.array = None
+            self._items = memoryview(mm)[offset:offset + 8 * length].cast('Q')
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, i):
+        return int(self._items[i])
+
+    def __contains__(self, n):
+        i = self.count_below(n)
+        return n >= 0 and i < len(self._items) and self._items[i] == n
+
+    # Сколько элементов меньше x (или не больше x при inclusive=True)
+    def count_below(self, x, inclusive=False):
+        if x < 0:
+            return 0
+        if self.array is not None:
+            return int(np.searchsorted(self.array, np.uint64(x), side='right' if inclusive else 'left'))
+        return (bisect_right if inclusive else bisect_left)(self._items, x)
+
+    # Элементы из [low, high) списком
+    def between(self, low, high):
+        return [int(x) for x in self._items[self.count_below(low):self.count_below(high)]]
+
+
+# Битовая карта из файла build_bitmap: тот же интерфейс, что у PrimeBitmap, проверка за O(1)
+class MappedBitmap:
+    def __init__(self, path):
+        self._mm = _map(path)
+        magic, version, self.limit = _BITMAP_HEADER.unpack_from(self._mm)
+        if magic != BITMAP_MAGIC or version != VERSION:
+            raise ValueError(f'{path}: не битовая карта простоты')
+        self.bits = memoryview(self._mm)[_BITMAP_HEADER.size:]
+
+    def __len__(self):
+        return self.limit + 1
+
+    def __getitem__(self, m):
+        if m < 0 or m > self.limit:
+            raise IndexError(m)
+        if m % 2 == 0:
+            return m == 2
+        k = m >> 1
+        return bool(self.bits[k >> 3] >> (k & 7) & 1)
+
+    def is_prime(self, n):
+        return n >= 0 and self[n]
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+# Массив простых из файла build_primes: n in primes, primes[i], primes.count_below(x) = pi(x - 1)
+class MappedPrimes(MappedArray):
+    def __init__(self, path):
+        mm = _map(path)
+        magic, version, self.limit, count = _PRIMES_HEADER.unpack_from(mm)
+        if magic != PRIMES_MAGIC or version != VERSION:
+            raise ValueError(f'{path}: не массив простых')
+        super().__init__(mm, _PRIMES_HEADER.size, count)
+
+
+# Разделы каталога псевдопростых (см. pseudoprimes.save_catalog) как отображённые массивы
+class MappedCatalog:
+    def __init__(self, path):
+        self.start, self.limit, index = read_index(path)
+        mm = _map(path)
+        self.sections = {name: MappedArray(mm, offset, length) for name, (offset, length, _) in index.items()}
+
+    def __getitem__(self, name):
+        return self.sections[name]
+
+    def __contains__(self, name):
+        return name in self.sections
+
+
+# Битовая карта простоты до limit из path; если файла нет или он покрывает меньший диапазон,
+# она строится и сохраняется
+def prime_table(path, limit):
+    if os.path.exists(path):
+        table = MappedBitmap(path)
+        if table.limit >= limit:
+            return table
+    build_bitmap(path, limit)
+    return MappedBitmap(path)